@@ -60,14 +60,14 @@ def main() -> None:
         print(f"Branch: {branch}")
     print("=" * 42)
     
-    # Configure environment
-    configure_reproducible_environment()
-    
     # Ensure repository
     if tag:
         logos_storage_dir, commit_info = ensure_logos_storage_repo(tag, None)
     else:
         logos_storage_dir, commit_info = ensure_logos_storage_repo(branch, commit)
+    
+    # Configure environment from the checked-out commit
+    configure_reproducible_environment(logos_storage_dir, commit_info.commit_time)
 
     print(f"Commit: {commit_info.commit} ({commit_info.commit_short})")
     print(f"Branch: {commit_info.branch}")
@@ -94,10 +94,10 @@ def main() -> None:
     copied_libraries = copy_libraries(libraries, dist_dir)
     
     # Copy header file
-    copy_header_file(logos_storage_dir, dist_dir)
+    header_path = copy_header_file(logos_storage_dir, dist_dir)
     
-    # Generate SHA256SUMS.txt for all files
-    generate_sha256sums(dist_dir)
+    # Generate SHA256SUMS.txt for the files this build produced
+    generate_sha256sums(dist_dir, files=[*copied_libraries, header_path])
     
     print("=" * 42)
     print("Build completed successfully!")
@@ -1,15 +1,50 @@
 """Artifact management for build system."""
 
+import errno
+import hashlib
+import mmap
 import os
 import platform
 import shutil
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Callable, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.utils import run_command
 
+# Read buffer size for streaming hashes, and the size above which files are memory-mapped
+_CHUNK_SIZE = 1 << 20
+_MMAP_THRESHOLD = 16 * 1024 * 1024
+_HAS_FILE_DIGEST = hasattr(hashlib, "file_digest")
+# Readahead hints for sequential hashing; not available on Windows/macOS
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+_HAS_MADVISE = hasattr(mmap, "MADV_SEQUENTIAL")
+
+# Records the submodule state and toolchain settings after the last successful
+# `make deps`, kept in the checkout's build/ directory with the other outputs
+_DEPS_STAMP = Path("build") / ".deps-stamp"
+
+# Build settings that change what `make deps` produces
+_DEPS_ENV_KEYS = ("CC", "CXX", "CFLAGS", "CXXFLAGS", "NIMFLAGS")
+
+# Concurrent rmtree workers used when cleaning build directories
+_CLEAN_WORKERS = 4
+
+_IS_WINDOWS = platform.system().lower() == "windows"
+_HAS_FWALK = hasattr(os, "fwalk") and os.unlink in os.supports_dir_fd
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+# copy_file_range errors that mean "not supported here" rather than a real failure
+_COPY_FILE_RANGE_FALLBACK_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, name, None)
+        for name in ("ENOSYS", "EXDEV", "EINVAL", "EOPNOTSUPP", "ENOTSUP")
+    )
+    if code is not None
+)
+
 
 def clean_build_artifacts(logos_storage_dir: Path) -> None:
     """Clean all build artifacts."""
@@ -19,9 +54,8 @@ def clean_build_artifacts(logos_storage_dir: Path) -> None:
     home = os.environ.get("HOME")
     if home:
         nim_cache = Path(home) / ".cache" / "nim" / "libstorage_d"
-        if nim_cache.exists():
-            print(f"Removing Nim cache: {nim_cache}")
-            shutil.rmtree(nim_cache)
+        if _remove_tree(nim_cache):
+            print(f"Removed Nim cache: {nim_cache}")
     
     # Clean build directories
     build_dirs = [
@@ -33,30 +67,128 @@ def clean_build_artifacts(logos_storage_dir: Path) -> None:
         "nimcache/debug",
     ]
     
-    for dir_name in build_dirs:
-        dir_path = logos_storage_dir / dir_name
-        if dir_path.exists():
-            print(f"Removing build directory: {dir_name}")
-            shutil.rmtree(dir_path)
+    # The trees are independent, so remove them concurrently
+    with ThreadPoolExecutor(max_workers=_CLEAN_WORKERS) as executor:
+        removed = list(executor.map(
+            _remove_tree, [logos_storage_dir / dir_name for dir_name in build_dirs]
+        ))
+    for dir_name, was_removed in zip(build_dirs, removed):
+        if was_removed:
+            print(f"Removed build directory: {dir_name}")
     
     # Clean .o files
     for dir_name in [
         "vendor/nim-nat-traversal/vendor/libnatpmp-upstream",
         "vendor/nim-nat-traversal/vendor/miniupnp/miniupnpc",
     ]:
-        dir_path = logos_storage_dir / dir_name
-        if dir_path.exists():
-            for path in dir_path.rglob("*.o"):
-                path.unlink()
+        _remove_object_files(logos_storage_dir / dir_name)
     
-    # Restore .gitkeep
-    gitkeep_dir = logos_storage_dir / "vendor" / "nim-leveldbstatic" / "build"
-    if gitkeep_dir.exists():
-        run_command(["git", "-C", str(gitkeep_dir), "restore", ".gitkeep"], check=False)
+    # Restore .gitkeep from the submodule root, since its build/ directory was
+    # removed above (a missing submodule just makes git exit non-zero)
+    leveldb_dir = logos_storage_dir / "vendor" / "nim-leveldbstatic"
+    run_command(["git", "-C", str(leveldb_dir), "restore", "build/.gitkeep"], check=False)
     
     print("Build artifacts cleaned")
 
 
+def _remove_tree(dir_path: Path) -> bool:
+    """Remove a directory tree, tolerating its absence.
+    
+    Returns:
+        True if the tree was removed, False if it did not exist
+    """
+    try:
+        shutil.rmtree(dir_path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _remove_object_files(dir_path: Path) -> None:
+    """Remove all .o files below a directory.
+    
+    Where supported, files are unlinked relative to an open descriptor of
+    their parent directory so the kernel does not resolve the full path
+    for every file. A missing directory is ignored.
+    """
+    if _HAS_FWALK:
+        try:
+            for _, _, files, dir_fd in os.fwalk(dir_path):
+                for name in files:
+                    if name.endswith(".o"):
+                        os.unlink(name, dir_fd=dir_fd)
+        except FileNotFoundError:
+            # Unlike os.walk, os.fwalk raises if the top directory is missing
+            pass
+    else:
+        for root, _, files in os.walk(dir_path):
+            for name in files:
+                if name.endswith(".o"):
+                    os.unlink(os.path.join(root, name))
+
+
+def _deps_fingerprint(logos_storage_dir: Path, build_env: Dict[str, str]) -> Optional[str]:
+    """Fingerprint the inputs of `make deps`.
+    
+    Args:
+        logos_storage_dir: Path to the logos-storage-nim repository
+        build_env: Environment overrides passed to make
+    
+    Returns:
+        SHA256 of `git submodule status --recursive` and the toolchain
+        settings in effect, or None if git fails
+    """
+    result = run_command(
+        ["git", "-C", str(logos_storage_dir), "submodule", "status", "--recursive"],
+        check=False
+    )
+    if result.returncode != 0:
+        return None
+    
+    h = hashlib.sha256(result.stdout.encode())
+    for key in _DEPS_ENV_KEYS:
+        value = build_env.get(key, os.environ.get(key, ""))
+        h.update(f"\0{key}={value}".encode())
+    return h.hexdigest()
+
+
+def _vendored_libraries(logos_storage_dir: Path) -> List[Tuple[str, Path]]:
+    """List the vendored static libraries built by `make deps`.
+    
+    Returns:
+        (name, path) pairs for libnatpmp, libminiupnpc and libbacktrace
+    """
+    # Note: On Windows, libminiupnpc.a is built in the root of miniupnpc directory,
+    # not in build/ subdirectory (uses Makefile.mingw)
+    miniupnpc_dir = logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "miniupnp" / "miniupnpc"
+    if not _IS_WINDOWS:
+        miniupnpc_dir = miniupnpc_dir / "build"
+    
+    return [
+        ("libnatpmp.a", logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "libnatpmp-upstream" / "libnatpmp.a"),
+        ("libminiupnpc.a", miniupnpc_dir / "libminiupnpc.a"),
+        ("libbacktrace.a", logos_storage_dir / "vendor" / "nim-libbacktrace" / "install" / "usr" / "lib" / "libbacktrace.a"),
+    ]
+
+
+def _deps_outputs_exist(logos_storage_dir: Path) -> bool:
+    """Check that the Nim compiler and vendored libraries from `make deps` are present."""
+    nim_binary = (
+        logos_storage_dir / "vendor" / "nimbus-build-system" / "vendor" / "Nim" / "bin"
+        / ("nim.exe" if _IS_WINDOWS else "nim")
+    )
+    outputs = [nim_binary] + [path for _, path in _vendored_libraries(logos_storage_dir)]
+    return all(path.exists() for path in outputs)
+
+
+def _read_stamp(stamp_path: Path) -> Optional[str]:
+    """Read a stamp file, returning None if it does not exist."""
+    try:
+        return stamp_path.read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
 def build_libstorage(logos_storage_dir: Path, jobs: int) -> None:
     """Build libstorage for host architecture."""
     print("Building libstorage for host architecture...")
@@ -82,28 +214,65 @@ def build_libstorage(logos_storage_dir: Path, jobs: int) -> None:
     else:
         print(f"Building for {arch} with default compiler settings")
     
-    # Update submodules first
-    print("Updating git submodules...")
-    try:
-        run_command(
-            ["make", "-C", str(logos_storage_dir), "deps"],
-            env=build_env
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Failed to update git submodules")
-        print(f"Command: {' '.join(e.cmd)}")
-        print(f"Exit code: {e.returncode}")
-        if e.stdout:
-            print(f"STDOUT:\n{e.stdout}")
-        if e.stderr:
-            print(f"STDERR:\n{e.stderr}")
-        raise
+    # Route C/C++ compiles through ccache when available so unchanged sources
+    # are served from the cache on rebuilds (the parent environment is
+    # inherited by run_command, so CCACHE_DIR etc. still apply). Skipped on
+    # Windows, where MinGW toolchains often provide gcc but no cc
+    if (
+        not _IS_WINDOWS
+        and shutil.which("ccache")
+        and "CC" not in os.environ
+        and "CXX" not in os.environ
+    ):
+        build_env["CC"] = "ccache cc"
+        build_env["CXX"] = "ccache c++"
+        build_env["CCACHE_BASEDIR"] = str(logos_storage_dir.resolve())
+        build_env["CCACHE_COMPRESS"] = "1"
+        print("Using ccache for C/C++ compilation")
+    
+    # Run make with parallel jobs, throttling job spawning when the load average
+    # climbs well above the job count (GNU make on Windows has no load average)
+    make_cmd = ["make", "-j", str(jobs)]
+    if not _IS_WINDOWS:
+        make_cmd += ["-l", f"{jobs * 1.5:.1f}"]
+    
+    # Update submodules first, unless they, the toolchain settings and the
+    # outputs are unchanged since the last successful run
+    deps_stamp = logos_storage_dir / _DEPS_STAMP
+    fingerprint = _deps_fingerprint(logos_storage_dir, build_env)
+    if (
+        fingerprint is not None
+        and _read_stamp(deps_stamp) == fingerprint
+        and _deps_outputs_exist(logos_storage_dir)
+    ):
+        print("Git submodules are up to date, skipping make deps")
+    else:
+        print("Updating git submodules...")
+        try:
+            run_command(
+                make_cmd + ["-C", str(logos_storage_dir), "deps"],
+                env=build_env
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"Error: Failed to update git submodules")
+            print(f"Command: {' '.join(e.cmd)}")
+            print(f"Exit code: {e.returncode}")
+            if e.stdout:
+                print(f"STDOUT:\n{e.stdout}")
+            if e.stderr:
+                print(f"STDERR:\n{e.stderr}")
+            raise
+        
+        fingerprint = _deps_fingerprint(logos_storage_dir, build_env)
+        if fingerprint is not None:
+            deps_stamp.parent.mkdir(parents=True, exist_ok=True)
+            deps_stamp.write_text(fingerprint)
     
     # Build with parallel jobs
     print(f"Building libstorage with {jobs} parallel jobs...")
     try:
         run_command(
-            ["make", "-j", str(jobs), "-C", str(logos_storage_dir), "libstorage"],
+            make_cmd + ["-C", str(logos_storage_dir), "libstorage"],
             env=build_env
         )
     except subprocess.CalledProcessError as e:
@@ -139,7 +308,6 @@ def collect_artifacts(
     
     Raises:
         FileNotFoundError: If any required library is not found
-        ValueError: If any library is incompatible with the target architecture
     """
     if path_exists is None:
         path_exists = lambda p: p.exists()
@@ -147,18 +315,9 @@ def collect_artifacts(
     libraries = []
     
     # Define all libraries to collect
-    # Note: On Windows, libminiupnpc.a is built in the root of miniupnpc directory,
-    # not in build/ subdirectory (uses Makefile.mingw)
-    if platform.system().lower() == "windows":
-        miniupnpc_path = logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "miniupnp" / "miniupnpc" / "libminiupnpc.a"
-    else:
-        miniupnpc_path = logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "miniupnp" / "miniupnpc" / "build" / "libminiupnpc.a"
-    
     artifact_paths = [
         ("libstorage.a", logos_storage_dir / "build" / "libstorage.a"),
-        ("libnatpmp.a", logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "libnatpmp-upstream" / "libnatpmp.a"),
-        ("libminiupnpc.a", miniupnpc_path),
-        ("libbacktrace.a", logos_storage_dir / "vendor" / "nim-libbacktrace" / "install" / "usr" / "lib" / "libbacktrace.a"),
+        *_vendored_libraries(logos_storage_dir),
     ]
     
     # Check standard libraries
@@ -171,6 +330,47 @@ def collect_artifacts(
     return libraries
 
 
+def _fast_copy(src: Path, dst: Path) -> None:
+    """Copy a file's contents, keeping the bytes in the kernel where possible.
+    
+    Uses os.copy_file_range (Linux), which never copies through user space and
+    can share extents on copy-on-write filesystems such as Btrfs and XFS.
+    Falls back to shutil.copyfile when it is unavailable or unsupported for
+    the pair of files, or when it copies nothing (e.g. procfs or FUSE sources).
+    
+    Raises:
+        shutil.SameFileError: If src and dst are the same file
+        OSError: If the copy stops short after part of the file was copied
+    """
+    # Opening dst for writing would truncate src before it is read
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    
+    if _HAS_COPY_FILE_RANGE:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+        except OSError as e:
+            if e.errno not in _COPY_FILE_RANGE_FALLBACK_ERRNOS:
+                raise
+        else:
+            if remaining == 0:
+                return
+            if remaining < size:
+                # The source shrank or the kernel gave up mid-copy; dst is truncated
+                raise OSError(
+                    f"Copy of {src} to {dst} stopped after {size - remaining} of {size} bytes"
+                )
+            # Nothing was copied: copy_file_range does not support this source
+    
+    shutil.copyfile(src, dst)
+
+
 def copy_libraries(libraries: List[Path], output_dir: Path) -> List[Path]:
     """Copy individual static libraries to output directory.
     
@@ -185,58 +385,105 @@ def copy_libraries(libraries: List[Path], output_dir: Path) -> List[Path]:
         FileNotFoundError: If any library cannot be copied
     """
     print(f"Copying {len(libraries)} libraries...")
-    copied_libraries = []
+    copied_libraries = [output_dir / lib_path.name for lib_path in libraries]
+    
+    # Copies are independent and release the GIL in the kernel copy, so run them
+    # concurrently. Files are copied rather than hard-linked so a later rebuild
+    # cannot modify the bundled libraries in place.
+    if libraries:
+        with ThreadPoolExecutor(max_workers=len(libraries)) as executor:
+            list(executor.map(_fast_copy, libraries, copied_libraries))
     
-    for lib_path in libraries:
-        dest_path = output_dir / lib_path.name
-        shutil.copy2(lib_path, dest_path)
-        copied_libraries.append(dest_path)
+    for lib_path, dest_path in zip(libraries, copied_libraries):
         print(f"[OK] Copied {lib_path.name} to {dest_path}")
     
     print(f"[OK] Successfully copied {len(copied_libraries)} libraries")
     return copied_libraries
 
 
-def generate_checksum(artifact_path: Path) -> None:
-    """Generate SHA256 checksum for an artifact."""
-    checksum_path = artifact_path.with_suffix(".a.sha256")
+def _sha256_file(path: Path) -> str:
+    """Compute the SHA256 hex digest of a file in-process.
+    
+    Large files are memory-mapped so the hash consumes page-cache pages
+    directly. Smaller files go through hashlib.file_digest (Python 3.11+),
+    which runs the read/update loop in C, or are streamed through one
+    reusable buffer on older interpreters. Either way the kernel is told the
+    file will be read sequentially so it can read ahead aggressively.
+    """
+    # Unbuffered: every path below reads in large blocks or maps the file, so a
+    # BufferedReader would only add setup syscalls and an extra copy
+    with open(path, "rb", buffering=0) as fp:
+        if os.fstat(fp.fileno()).st_size > _MMAP_THRESHOLD:
+            h = hashlib.sha256()
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _HAS_MADVISE:
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)
+            return h.hexdigest()
+
+        if _HAS_FADVISE:
+            os.posix_fadvise(fp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        if _HAS_FILE_DIGEST:
+            h = hashlib.file_digest(fp, "sha256")
+        else:
+            h = hashlib.sha256()
+            buf = bytearray(_CHUNK_SIZE)
+            view = memoryview(buf)
+            while n := fp.readinto(buf):
+                h.update(view[:n])
+    return h.hexdigest()
+
+
+def generate_checksum(artifact_path: Path) -> str:
+    """Generate SHA256 checksum for an artifact.
     
-    # Use certutil on Windows, sha256sum on Unix
-    if platform.system().lower() == "windows":
-        result = run_command(["certutil", "-hashfile", str(artifact_path), "SHA256"])
-        # certutil output format is different
-        checksum_line = result.stdout.strip().split('\n')[1].replace(' ', '')
-        checksum_path.write_text(f"{checksum_line}  {artifact_path.name}")
-    else:
-        result = run_command(["sha256sum", str(artifact_path)])
-        checksum_path.write_text(result.stdout)
+    Args:
+        artifact_path: Path to the artifact to checksum
+        
+    Returns:
+        SHA256 hex digest written to the .sha256 file
+    """
+    digest = _sha256_file(artifact_path)
+    checksum_path = artifact_path.with_suffix(".a.sha256")
+    checksum_path.write_text(f"{digest}  {artifact_path.name}\n")
     
     print(f"[OK] Generated checksum: {checksum_path}")
+    return digest
 
 
-def verify_checksum(artifact_path: Path) -> bool:
-    checksum_path = artifact_path.with_suffix(".a.sha256")
+def verify_checksum(artifact_path: Path, expected_hash: Optional[str] = None) -> bool:
+    """Verify an artifact against its SHA256 checksum.
     
-    if not checksum_path.exists():
-        raise FileNotFoundError(f"Checksum file not found: {checksum_path}")
+    Args:
+        artifact_path: Path to the artifact to verify
+        expected_hash: Optional expected hex digest, e.g. as returned by
+                       generate_checksum. If None, it is read from the
+                       artifact's .sha256 file.
+        
+    Returns:
+        True if the checksum matches
+        
+    Raises:
+        FileNotFoundError: If no expected hash is given and the checksum file is missing
+        ValueError: If the checksum does not match
+    """
+    if expected_hash is None:
+        checksum_path = artifact_path.with_suffix(".a.sha256")
+        
+        if not checksum_path.exists():
+            raise FileNotFoundError(f"Checksum file not found: {checksum_path}")
+        
+        # Read expected checksum
+        expected_checksum = checksum_path.read_text().strip()
+        expected_hash = expected_checksum.split()[0]
     
     print(f"Verifying {artifact_path.name} against checksum...")
     
-    # Read expected checksum
-    expected_checksum = checksum_path.read_text().strip()
-    expected_hash = expected_checksum.split()[0]
-    
-    # Compute actual checksum
-    if platform.system().lower() == "windows":
-        result = run_command(["certutil", "-hashfile", str(artifact_path), "SHA256"])
-        actual_hash = result.stdout.strip().split('\n')[1].replace(' ', '')
-    else:
-        result = run_command(["sha256sum", str(artifact_path)])
-        actual_checksum = result.stdout.strip()
-        actual_hash = actual_checksum.split()[0]
+    # Always re-read the file: an integrity check cannot trust stat metadata
+    actual_hash = _sha256_file(artifact_path)
     
-    # Compare
-    if expected_hash == actual_hash:
+    # Compare checksums
+    if expected_hash.lower() == actual_hash:
         print(f"[OK] Checksum verification passed for {artifact_path.name}")
         return True
     else:
@@ -268,53 +515,53 @@ def copy_header_file(logos_storage_dir: Path, output_dir: Path) -> Path:
         )
     
     header_dest = output_dir / "libstorage.h"
-    shutil.copy2(header_source, header_dest)
+    _fast_copy(header_source, header_dest)
     print(f"[OK] Copied libstorage.h to {header_dest}")
     
     return header_dest
 
 
-def generate_sha256sums(output_dir: Path) -> Path:
+def generate_sha256sums(output_dir: Path, files: Optional[Iterable[Path]] = None) -> Path:
     """Generate SHA256SUMS.txt for all files in output directory.
     
     Args:
         output_dir: Path to the directory containing artifacts
+        files: Optional files inside output_dir to checksum. When given, the
+               directory is not scanned and only these files are listed.
         
     Returns:
         Path to the generated SHA256SUMS.txt file
     """
     checksums_path = output_dir / "SHA256SUMS.txt"
     
-    # Find all files to checksum (exclude the checksum file itself)
-    files_to_checksum = [
-        f for f in output_dir.iterdir()
-        if f.is_file() and f.name != "SHA256SUMS.txt"
-    ]
+    if files is None:
+        # Find all files to checksum (exclude the checksum file itself).
+        # scandir answers is_file() from the directory listing without a stat()
+        with os.scandir(output_dir) as it:
+            dir_entries = sorted(
+                (e for e in it if e.name != checksums_path.name and e.is_file()),
+                key=attrgetter("name")
+            )
+        files_to_checksum = [Path(e.path) for e in dir_entries]
+    else:
+        files_to_checksum = sorted((Path(f) for f in files), key=attrgetter("name"))
     
     if not files_to_checksum:
         raise FileNotFoundError(f"No files found in {output_dir} to generate checksums")
     
-    # Generate checksums without changing directory
-    checksums = []
-    for file_path in sorted(files_to_checksum):
-        # Use certutil on Windows, sha256sum on Unix
-        if platform.system().lower() == "windows":
-            result = run_command(["certutil", "-hashfile", str(file_path), "SHA256"])
-            # certutil output format is different
-            checksum_line = result.stdout.strip().split('\n')[1].replace(' ', '')
-            checksums.append(f"{checksum_line}  {file_path.name}")
-        else:
-            result = run_command(["sha256sum", str(file_path)])
-            # Extract just the filename from the output
-            checksum_line = result.stdout.strip()
-            # Replace full path with just filename
-            checksum_parts = checksum_line.split()
-            if len(checksum_parts) >= 2:
-                checksum_parts[1] = file_path.name
-                checksums.append("  ".join(checksum_parts))
+    # Hash files concurrently (hashlib releases the GIL)
+    max_workers = min(len(files_to_checksum), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = dict(zip(files_to_checksum, executor.map(_sha256_file, files_to_checksum)))
+    
+    # Record bare filenames so `sha256sum -c` works from within the directory
+    checksums = [
+        f"{digests[file_path]}  {file_path.name}"
+        for file_path in files_to_checksum
+    ]
     
     # Write checksums file with Unix line endings (LF only) for cross-platform compatibility
     checksums_path.write_text("\n".join(checksums) + "\n", newline="\n")
     print(f"[OK] Generated SHA256SUMS.txt with {len(checksums)} entries")
     
-    return checksums_path
\ No newline at end of file
+    return checksums_path
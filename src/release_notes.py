@@ -6,10 +6,19 @@ including extracting PR numbers and creating formatted links.
 
 import re
 import subprocess
+import tempfile
 import urllib.request
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Iterator, Optional
+
+# Patterns are compiled once and reused for every commit in the range
+_PR_RE = re.compile(r"#(\d+)")
+_AUTHOR_RE = re.compile(r"\(([^)]+)\)$")
+_PR_STRIP_RE = re.compile(r"\s*\(#\d+\)")
+
+# Maximum bytes read from git per call while streaming the log
+_READ_SIZE = 64 * 1024
 
 
 def extract_pr_number(commit_message: str) -> Optional[int]:
@@ -27,7 +36,7 @@ def extract_pr_number(commit_message: str) -> Optional[int]:
         >>> extract_pr_number("fix: bug fix")
         None
     """
-    match = re.search(r"#(\d+)", commit_message)
+    match = _PR_RE.search(commit_message)
     if match:
         return int(match.group(1))
     return None
@@ -49,7 +58,7 @@ def extract_author(commit_message: str) -> Optional[str]:
         None
     """
     # Try to match author in parentheses at the end
-    match = re.search(r"\(([^)]+)\)$", commit_message)
+    match = _AUTHOR_RE.search(commit_message)
     if match:
         return match.group(1)
     return None
@@ -105,7 +114,7 @@ def format_commit_entry(
     pr_number = extract_pr_number(commit_message)
 
     # Remove PR number from message if present
-    clean_message = re.sub(r"\s*\(#\d+\)", "", commit_message).strip()
+    clean_message = _PR_STRIP_RE.sub("", commit_message).strip()
 
     # Get GitHub username from PR if available
     github_username = None
@@ -129,46 +138,63 @@ def get_commits_between(
     repo_path: Path,
     previous_commit: str,
     current_commit: str
-) -> List[dict]:
+) -> Iterator[dict]:
     """Get commits between two commits.
 
+    Commits are parsed as git prints them, so the log is never held in
+    memory as a whole. This is a generator: git is only run once iteration
+    starts.
+
     Args:
         repo_path: Path to the git repository
         previous_commit: The previous commit hash
         current_commit: The current commit hash
 
-    Returns:
-        List of commit dictionaries with keys: hash, message, author
+    Yields:
+        Commit dictionaries with keys: hash, message, author
 
     Raises:
-        subprocess.CalledProcessError: If git command fails
+        subprocess.CalledProcessError: During iteration, once the log is
+            exhausted, if the git command failed
     """
-    # Get commit log with hash, message, and author
-    result = subprocess.run(
-        [
-            "git",
-            "log",
-            "--pretty=format:%H|%s|%an",
-            f"{previous_commit}..{current_commit}"
-        ],
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-        check=True
-    )
-
-    commits = []
-    for line in result.stdout.strip().split("\n"):
-        if line:
-            parts = line.split("|", 2)
-            if len(parts) == 3:
-                commits.append({
-                    "hash": parts[0][:7],  # Short hash
-                    "message": parts[1],
-                    "author": parts[2]
-                })
-
-    return commits
+    # stderr goes to a file rather than a pipe: a pipe is only drained after
+    # stdout, so git could block writing to it and never close stdout
+    with tempfile.TemporaryFile() as stderr_file:
+        # Stream commit log with hash, message, and author as NUL-separated fields
+        with subprocess.Popen(
+            [
+                "git",
+                "log",
+                "-z",
+                "--pretty=format:%H%x00%s%x00%an",
+                f"{previous_commit}..{current_commit}"
+            ],
+            cwd=repo_path,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        ) as proc:
+            fields = _iter_nul_fields(proc.stdout)
+            for commit_hash, message, author in zip(fields, fields, fields):
+                yield {
+                    "hash": commit_hash[:7].decode(),  # Short hash
+                    "message": message.decode("utf-8", errors="replace"),
+                    "author": author.decode("utf-8", errors="replace")
+                }
+
+        if proc.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, stderr=stderr)
+
+
+def _iter_nul_fields(stream: BinaryIO) -> Iterator[bytes]:
+    """Split a binary stream into NUL-separated fields as data arrives."""
+    pending = b""
+    for chunk in iter(lambda: stream.read1(_READ_SIZE), b""):
+        *fields, pending = (pending + chunk).split(b"\0")
+        yield from fields
+    if pending:
+        yield pending
 
 
 def format_release_notes(
@@ -195,10 +221,7 @@ def format_release_notes(
     """
     commits = get_commits_between(repo_path, previous_commit, current_commit)
 
-    if not commits:
-        return "No commits found between releases"
-
-    # Format each commit
+    # Format each commit as it is read from git
     formatted_commits = [
         format_commit_entry(
             commit["hash"],
@@ -210,6 +233,9 @@ def format_release_notes(
         for commit in commits
     ]
 
+    if not formatted_commits:
+        return "No commits found between releases"
+
     return "\n".join(formatted_commits)
 
 
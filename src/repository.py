@@ -1,11 +1,21 @@
 """Repository management for logos-storage-nim."""
 
+import functools
+import os
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 from src.utils import run_command
 
+REPO_URL = "https://github.com/logos-storage/logos-storage-nim.git"
+
 
 @dataclass
 class CommitInfo:
@@ -13,6 +23,7 @@ class CommitInfo:
     commit: str
     commit_short: str
     branch: str
+    commit_time: Optional[int] = None
 
 
 def validate_commit_exists(repo_dir: Path, commit: str) -> bool:
@@ -25,8 +36,9 @@ def validate_commit_exists(repo_dir: Path, commit: str) -> bool:
     Returns:
         True if commit exists, False otherwise
     """
+    # Peeling to ^{commit} also rejects hashes of trees, blobs and tags
     result = run_command(
-        ["git", "-C", str(repo_dir), "cat-file", "-e", commit],
+        ["git", "-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"],
         check=False
     )
     return result.returncode == 0
@@ -35,6 +47,10 @@ def validate_commit_exists(repo_dir: Path, commit: str) -> bool:
 def validate_commit_in_branch(repo_dir: Path, commit: str, branch: str) -> bool:
     """Validate that a commit exists in a specific branch.
     
+    The commit is checked against the remote-tracking branch, which every clone
+    and update fetches, and against the local branch only when no such
+    remote-tracking branch exists.
+    
     Args:
         repo_dir: Path to the repository
         commit: Commit hash to validate
@@ -43,78 +59,184 @@ def validate_commit_in_branch(repo_dir: Path, commit: str, branch: str) -> bool:
     Returns:
         True if commit exists in the branch, False otherwise
     """
-    # Check if commit is reachable from the branch
+    for ref in (f"refs/remotes/origin/{branch}", f"refs/heads/{branch}"):
+        # Exit status 0 means ancestor, 1 means not an ancestor and anything
+        # else means the commit or ref could not be resolved
+        result = run_command(
+            ["git", "-C", str(repo_dir), "merge-base", "--is-ancestor", commit, ref],
+            check=False
+        )
+        if result.returncode in (0, 1):
+            return result.returncode == 0
+    
+    return False
+
+
+@functools.cache
+def _fetch_remote_tags() -> frozenset:
+    """Fetch the names of all tags in the remote repository.
+    
+    The remote is queried once per process; later calls reuse the result.
+    
+    Returns:
+        Frozen set of tag names, empty if the remote could not be queried
+    """
     result = run_command(
-        ["git", "-C", str(repo_dir), "branch", "--contains", commit],
+        ["git", "ls-remote", "--tags", REPO_URL],
         check=False
     )
-    
     if result.returncode != 0:
-        return False
+        return frozenset()
     
-    # Check if the branch is in the output
-    return branch in result.stdout
+    tags = set()
+    for line in result.stdout.splitlines():
+        _, _, ref = line.partition("\t")
+        if ref.startswith("refs/tags/"):
+            # Annotated tags are listed twice, once peeled with a ^{} suffix
+            tags.add(ref[len("refs/tags/"):].removesuffix("^{}"))
+    return frozenset(tags)
 
 
 def is_tag(ref: str) -> bool:
     """Check if a ref is a tag.
     
+    Answered from a single cached listing of the remote tags, so the remote
+    is queried at most once per process whatever the number of refs checked.
+    
     Args:
         ref: Reference to check (branch name or tag)
         
     Returns:
         True if ref is a tag, False otherwise
     """
-    # Check if the ref exists as a tag in the remote repository
-    result = run_command(
-        ["git", "ls-remote", "--tags", "https://github.com/logos-storage/logos-storage-nim.git", f"refs/tags/{ref}"],
-        check=False
-    )
-    # git ls-remote returns exit code 0 even when no tags match
-    # We need to check if stdout is non-empty to determine if the tag exists
-    return result.returncode == 0 and result.stdout.strip() != ""
+    return ref in _fetch_remote_tags()
+
 
+def get_mirror_dir() -> Optional[Path]:
+    """Get the local mirror directory configured through the GIT_MIRROR env var.
+    
+    Returns:
+        Path to the bare mirror, or None if mirroring is disabled
+    """
+    mirror = os.environ.get("GIT_MIRROR")
+    return Path(mirror).expanduser() if mirror else None
 
-def clone_repository(target_dir: Path, branch: str, commit: Optional[str] = None) -> None:
+
+@contextmanager
+def _mirror_lock(mirror_dir: Path) -> Iterator[None]:
+    """Hold an exclusive lock on the mirror so concurrent builds don't race."""
+    if fcntl is None:
+        yield
+        return
+    
+    lock_path = mirror_dir.with_name(f"{mirror_dir.name}.lock")
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def update_mirror(mirror_dir: Path) -> None:
+    """Create or refresh a bare mirror of logos-storage-nim.
+    
+    The mirror is used as a clone reference so repeated clones only transfer
+    objects that are not already available locally.
+    
+    Args:
+        mirror_dir: Path to the bare mirror repository
+    """
+    mirror_dir.parent.mkdir(parents=True, exist_ok=True)
+    
+    with _mirror_lock(mirror_dir):
+        if (mirror_dir / "HEAD").exists():
+            print(f"Updating logos-storage-nim mirror: {mirror_dir}")
+            run_command(["git", "-C", str(mirror_dir), "remote", "update", "--prune"], capture=False)
+        else:
+            print(f"Creating logos-storage-nim mirror: {mirror_dir}")
+            run_command(["git", "clone", "--mirror", REPO_URL, str(mirror_dir)], capture=False)
+
+
+def clone_repository(
+    target_dir: Path,
+    branch: str,
+    commit: Optional[str] = None,
+    reference: Optional[Path] = None
+) -> None:
     """Clone the logos-storage-nim repository.
     
+    Branch and commit clones are partial (--filter=blob:none): the full commit
+    graph is fetched so branch and commit validation keep working, but file
+    contents are only downloaded for the revision that gets checked out. Tag
+    clones are shallow and only fetch the tagged commit; update_repository
+    fetches the rest of the history if the checkout is later reused for a
+    branch or commit.
+    
     Args:
         target_dir: Directory to clone into
         branch: Branch to clone (used if commit is not specified)
         commit: Optional commit hash to checkout (mutually exclusive with branch)
+        reference: Optional local mirror to borrow objects from. Objects are
+                   copied into the clone (--dissociate), so the mirror can be
+                   removed later without breaking it.
     """
+    reference_args = []
+    if reference is not None:
+        reference_args = ["--reference-if-able", str(reference), "--dissociate"]
+    
     # Check if branch is actually a tag
     if is_tag(branch):
         print(f"Cloning logos-storage-nim repository (tag: {branch})...")
-        # Clone without checkout
+        # A tag never moves, so a shallow clone of just that tag is enough;
+        # --branch leaves HEAD detached at the tag
         run_command([
-            "git", "clone", "--no-checkout",
-            "https://github.com/logos-storage/logos-storage-nim.git",
+            "git", "clone", "--depth=1", "--branch", branch, "--single-branch", "--no-tags",
+            *reference_args,
+            REPO_URL,
             str(target_dir)
-        ])
-        # Fetch all objects
-        run_command(["git", "-C", str(target_dir), "fetch", "--all", "--tags"])
-        # Checkout the tag
-        run_command(["git", "-C", str(target_dir), "checkout", f"refs/tags/{branch}"])
+        ], capture=False)
+        # --single-branch narrows the fetch refspec to this tag; widen it again
+        # (a local config change) so later fetches see upstream branches. This
+        # does not deepen history: update_repository unshallows the checkout
+        # before validating a branch or commit against it
+        run_command(["git", "-C", str(target_dir), "remote", "set-branches", "origin", "*"])
     elif commit:
         print(f"Cloning logos-storage-nim repository (commit: {commit})...")
         # Clone without checkout
         run_command([
-            "git", "clone", "--no-checkout",
-            "https://github.com/logos-storage/logos-storage-nim.git",
+            "git", "clone", "--no-checkout", "--filter=blob:none", *reference_args,
+            REPO_URL,
             str(target_dir)
-        ])
-        # Fetch all objects
-        run_command(["git", "-C", str(target_dir), "fetch", "--all", "--tags"])
+        ], capture=False)
+        # The clone already holds every commit reachable from a branch; only
+        # fetch when the commit is not among them
+        if not validate_commit_exists(target_dir, commit):
+            run_command(["git", "-C", str(target_dir), "fetch", "origin", commit], capture=False)
         # Checkout specific commit
-        run_command(["git", "-C", str(target_dir), "checkout", commit])
+        run_command(["git", "-C", str(target_dir), "checkout", commit], capture=False)
     else:
         print(f"Cloning logos-storage-nim repository (branch: {branch})...")
         run_command([
-            "git", "clone", "--branch", branch,
-            "https://github.com/logos-storage/logos-storage-nim.git",
+            "git", "clone", "--branch", branch, "--filter=blob:none", *reference_args,
+            REPO_URL,
             str(target_dir)
-        ])
+        ], capture=False)
+
+
+def _unshallow_repository(repo_dir: Path) -> None:
+    """Fetch the full history into a checkout left shallow by a tag clone.
+    
+    Args:
+        repo_dir: Path to the repository
+    """
+    result = run_command(
+        ["git", "-C", str(repo_dir), "rev-parse", "--is-shallow-repository"],
+        check=False
+    )
+    if result.stdout.strip() == "true":
+        print("Fetching full history of shallow logos-storage-nim clone...")
+        run_command(["git", "-C", str(repo_dir), "fetch", "--unshallow", "origin"], capture=False)
 
 
 def update_repository(repo_dir: Path, branch: str, commit: Optional[str] = None) -> None:
@@ -129,57 +251,65 @@ def update_repository(repo_dir: Path, branch: str, commit: Optional[str] = None)
     if is_tag(branch):
         print(f"Updating logos-storage-nim repository (tag: {branch})...")
         # Fetch all objects
-        run_command(["git", "-C", str(repo_dir), "fetch", "--all", "--tags"])
+        run_command(["git", "-C", str(repo_dir), "fetch", "--all", "--tags"], capture=False)
         # Checkout the tag
-        run_command(["git", "-C", str(repo_dir), "checkout", f"refs/tags/{branch}"])
+        run_command(["git", "-C", str(repo_dir), "checkout", f"refs/tags/{branch}"], capture=False)
     elif commit:
         print(f"Updating logos-storage-nim repository (commit: {commit})...")
         # Fetch all objects
-        run_command(["git", "-C", str(repo_dir), "fetch", "--all", "--tags"])
+        run_command(["git", "-C", str(repo_dir), "fetch", "--all", "--tags"], capture=False)
+        # A checkout reused from a tag build only has the tagged commit
+        _unshallow_repository(repo_dir)
         
         # Validate commit exists
         if not validate_commit_exists(repo_dir, commit):
             raise ValueError(f"Commit '{commit}' not found in repository")
         
         # Checkout specific commit
-        run_command(["git", "-C", str(repo_dir), "checkout", commit])
+        run_command(["git", "-C", str(repo_dir), "checkout", commit], capture=False)
     else:
         print(f"Updating logos-storage-nim repository (branch: {branch})...")
         # Fetch all branches
-        run_command(["git", "-C", str(repo_dir), "fetch", "origin"])
-        
-        # Check if branch exists
-        has_local = run_command(
-            ["git", "-C", str(repo_dir), "show-ref", "--verify", "--quiet", f"refs/heads/{branch}"],
-            check=False
-        ).returncode == 0
+        run_command(["git", "-C", str(repo_dir), "fetch", "origin"], capture=False)
+        # A checkout reused from a tag build only has the tagged commit
+        _unshallow_repository(repo_dir)
         
-        has_remote = run_command(
-            ["git", "-C", str(repo_dir), "show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch}"],
+        # Check if branch exists locally or on origin with a single ref listing
+        local_ref = f"refs/heads/{branch}"
+        remote_ref = f"refs/remotes/origin/{branch}"
+        existing_refs = set(run_command(
+            ["git", "-C", str(repo_dir), "for-each-ref", "--format=%(refname)", local_ref, remote_ref],
             check=False
-        ).returncode == 0
+        ).stdout.split())
         
-        if not has_local and not has_remote:
+        if local_ref not in existing_refs and remote_ref not in existing_refs:
             raise ValueError(f"Branch '{branch}' not found")
         
         # Checkout and pull
-        run_command(["git", "-C", str(repo_dir), "checkout", branch])
-        run_command(["git", "-C", str(repo_dir), "pull", "origin", branch])
+        run_command(["git", "-C", str(repo_dir), "checkout", branch], capture=False)
+        run_command(["git", "-C", str(repo_dir), "pull", "origin", branch], capture=False)
 
 
 def get_commit_info(repo_dir: Path) -> CommitInfo:
     """Get commit information from the repository."""
-    commit = run_command(["git", "-C", str(repo_dir), "rev-parse", "HEAD"]).stdout.strip()
-    commit_short = run_command(["git", "-C", str(repo_dir), "rev-parse", "--short", "HEAD"]).stdout.strip()
+    # One git call prints the full hash, the short hash, the committer time and
+    # the HEAD decoration, which reads "HEAD -> <branch>" on a branch and plain
+    # "HEAD" when detached
+    result = run_command([
+        "git", "-C", str(repo_dir), "log", "-1",
+        "--decorate=short", "--decorate-refs=HEAD", "--decorate-refs=refs/heads/",
+        "--format=%H%n%h%n%ct%n%D"
+    ])
+    commit, commit_short, commit_time, decoration = (result.stdout.splitlines() + [""] * 4)[:4]
     
     # Get branch name, or "HEAD" if in detached state
-    branch_result = run_command(
-        ["git", "-C", str(repo_dir), "rev-parse", "--abbrev-ref", "HEAD"],
-        check=False
-    )
-    branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "HEAD"
+    branch = "HEAD"
+    for ref in decoration.split(", "):
+        if ref.startswith("HEAD -> "):
+            branch = ref[len("HEAD -> "):]
+            break
     
-    return CommitInfo(commit, commit_short, branch)
+    return CommitInfo(commit, commit_short, branch, int(commit_time) if commit_time.isdigit() else None)
 
 
 def ensure_logos_storage_repo(branch: str, commit: Optional[str] = None) -> Tuple[Path, CommitInfo]:
@@ -196,15 +326,19 @@ def ensure_logos_storage_repo(branch: str, commit: Optional[str] = None) -> Tupl
         ValueError: If commit is specified but doesn't exist in the branch
     """
     logos_storage_dir = Path("logos-storage-nim")
+    branch_is_tag = is_tag(branch)
     
     if not logos_storage_dir.exists():
-        clone_repository(logos_storage_dir, branch, commit)
+        mirror_dir = get_mirror_dir()
+        if mirror_dir is not None:
+            update_mirror(mirror_dir)
+        clone_repository(logos_storage_dir, branch, commit, reference=mirror_dir)
     else:
         update_repository(logos_storage_dir, branch, commit)
     
     # If both branch and commit are specified, validate commit is in branch
     # Skip this validation if branch is a tag
-    if branch and commit and not is_tag(branch):
+    if branch and commit and not branch_is_tag:
         if not validate_commit_in_branch(logos_storage_dir, commit, branch):
             raise ValueError(
                 f"Commit '{commit}' does not exist in branch '{branch}'. "
@@ -216,7 +350,7 @@ def ensure_logos_storage_repo(branch: str, commit: Optional[str] = None) -> Tupl
     # If branch is a tag, use the tag name as the branch
     # If both branch and commit are specified, override the branch name
     # This ensures artifact names use the actual branch/tag name instead of "HEAD"
-    if is_tag(branch):
+    if branch_is_tag:
         commit_info.branch = branch
     elif branch and commit:
         commit_info.branch = branch
@@ -1,14 +1,25 @@
 """Utility functions for the build system."""
 
+import functools
 import os
 import platform
 import subprocess
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
+# Honours CPU affinity masks (taskset, container cpusets) where available
+_HAS_SCHED_GETAFFINITY = hasattr(os, "sched_getaffinity")
 
-def run_command(cmd: List[str], cwd: Path = None, env: dict = None, check: bool = True, binary: bool = False) -> subprocess.CompletedProcess:
+
+def run_command(
+    cmd: List[str],
+    cwd: Path = None,
+    env: dict = None,
+    check: bool = True,
+    binary: bool = False,
+    capture: bool = True
+) -> subprocess.CompletedProcess:
     """Run a command and return the result.
     
     Args:
@@ -17,37 +28,58 @@ def run_command(cmd: List[str], cwd: Path = None, env: dict = None, check: bool
         env: Environment variables
         check: Whether to raise exception on non-zero exit code
         binary: If True, return binary output instead of text
+        capture: If False, the command writes straight to the parent's stdout
+                 and stderr instead of being buffered; stdout and stderr on the
+                 result are then None
     """
     kwargs = {"check": check}
     if cwd:
         kwargs["cwd"] = cwd
     if env:
         kwargs["env"] = {**os.environ, **env}
+    if capture:
+        kwargs["capture_output"] = True
+        kwargs["text"] = not binary
     
-    return subprocess.run(cmd, capture_output=True, text=not binary, **kwargs)
+    return subprocess.run(cmd, **kwargs)
+
+
+# Normalized architecture names for the spellings platform.machine() reports
+_ARCH_ALIASES = {
+    "x86_64": "x86_64",
+    "amd64": "x86_64",
+    "aarch64": "aarch64",
+    "arm64": "aarch64",
+    "i686": "i686",
+    "i386": "i686",
+}
+
+# Artifact platform identifiers keyed by (system, normalized architecture)
+_PLATFORM_IDS = {
+    ("darwin", "aarch64"): "darwin-arm64",
+    ("darwin", "x86_64"): "darwin-amd64",
+    ("linux", "aarch64"): "linux-arm64",
+    ("linux", "x86_64"): "linux-amd64",
+    ("windows", "x86_64"): "windows-amd64",
+    ("windows", "aarch64"): "windows-arm64",
+}
+
+_KNOWN_SYSTEMS = frozenset(system for system, _ in _PLATFORM_IDS)
 
 
+@functools.cache
 def get_host_triple() -> str:
     """
-    Get the host architecture for compatibility checking.
+    Get the normalized machine architecture of the host.
     
-    Returns the architecture identifier (e.g., x86_64, aarch64)
-    which is used to check artifact compatibility with the 'file' command.
-    The 'file' command outputs architecture info like "aarch64" or "x86-64",
-    so we just need to match these keywords.
+    Returns the architecture identifier (e.g., x86_64, aarch64), with
+    platform aliases such as amd64 and arm64 mapped to these names.
     """
     machine = platform.machine().lower()
-    
-    if machine in ("x86_64", "amd64"):
-        return "x86_64"
-    elif machine in ("aarch64", "arm64"):
-        return "aarch64"
-    elif machine in ("i686", "i386"):
-        return "i686"
-    else:
-        return machine
+    return _ARCH_ALIASES.get(machine, machine)
 
 
+@functools.cache
 def get_platform_identifier() -> str:
     """
     Get platform identifier for artifact naming.
@@ -58,58 +90,68 @@ def get_platform_identifier() -> str:
     system = platform.system().lower()
     machine = platform.machine().lower()
     
-    if system == "darwin":
-        if machine in ("aarch64", "arm64"):
-            return "darwin-arm64"
-        elif machine in ("x86_64", "amd64"):
-            return "darwin-amd64"
-        else:
-            return "darwin-unknown"
-    elif system == "linux":
-        if machine in ("aarch64", "arm64"):
-            return "linux-arm64"
-        elif machine in ("x86_64", "amd64"):
-            return "linux-amd64"
-        else:
-            return "linux-unknown"
-    elif system == "windows":
-        if machine in ("x86_64", "amd64"):
-            return "windows-amd64"
-        elif machine in ("aarch64", "arm64"):
-            return "windows-arm64"
-        else:
-            return "windows-unknown"
-    else:
-        return f"{system}-{machine}"
+    platform_id = _PLATFORM_IDS.get((system, _ARCH_ALIASES.get(machine)))
+    if platform_id is not None:
+        return platform_id
+    if system in _KNOWN_SYSTEMS:
+        return f"{system}-unknown"
+    return f"{system}-{machine}"
+
+
+@functools.cache
+def _cpu_count() -> int:
+    """Get the number of CPUs this process may run on, detected once per process."""
+    if _HAS_SCHED_GETAFFINITY:
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 
 def get_parallel_jobs() -> int:
-    """Get number of parallel jobs (leaves one core free)."""
-    try:
-        # Use sysctl on macOS, nproc on Linux
-        system = platform.system().lower()
-        if system == "darwin":
-            cmd = ["sysctl", "-n", "hw.ncpu"]
-        else:
-            cmd = ["nproc"]
+    """Get number of parallel jobs (leaves one core free).
+    
+    The JOBS environment variable, when set to a positive integer, overrides
+    the detected value; it is capped at the number of usable CPUs.
+    """
+    cpus = _cpu_count()
+    jobs = os.environ.get("JOBS", "").strip()
+    # isdecimal() rejects digits int() cannot parse, such as superscripts
+    if jobs.isdecimal() and int(jobs) > 0:
+        return min(cpus, int(jobs))
+    
+    return max(1, cpus - 1)
+
+
+def configure_reproducible_environment(
+    repo_dir: Optional[Path] = None,
+    commit_time: Optional[int] = None
+) -> None:
+    """Set environment variables for reproducible builds.
+    
+    SOURCE_DATE_EPOCH is taken from the last commit of the repository being
+    built, so it stays stable across runs of the same commit and keeps
+    compiler caches warm.
+    
+    Args:
+        repo_dir: Repository whose HEAD commit time is used. Defaults to the
+                  current working directory.
+        commit_time: HEAD commit time if the caller already knows it, which
+                     saves querying git again
+    """
+    if commit_time is not None:
+        source_date_epoch = str(commit_time)
+    else:
+        cmd = ["git", "log", "-1", "--format=%ct"]
+        if repo_dir is not None:
+            cmd[1:1] = ["-C", str(repo_dir)]
         
-        result = run_command(cmd, check=False)
-        if result.returncode == 0:
-            cpu_count = int(result.stdout.strip())
-            return max(1, cpu_count - 1)
-    except (FileNotFoundError, ValueError):
-        pass
-    return 1
-
-
-def configure_reproducible_environment() -> None:
-    """Set environment variables for reproducible builds."""
-    try:
-        result = run_command(["git", "log", "-1", "--format=%ct"], check=False)
-        source_date_epoch = result.stdout.strip() if result.returncode == 0 else "0"
-    except FileNotFoundError:
-        source_date_epoch = "0"
+        try:
+            result = run_command(cmd, check=False)
+            source_date_epoch = result.stdout.strip() if result.returncode == 0 else "0"
+        except FileNotFoundError:
+            source_date_epoch = "0"
     
     os.environ["SOURCE_DATE_EPOCH"] = source_date_epoch
     os.environ["TZ"] = "UTC"
-    os.environ["LC_ALL"] = "C.UTF-8"
\ No newline at end of file
+    os.environ["LC_ALL"] = "C.UTF-8"
+    # Make macOS ar/ranlib write zero member timestamps
+    os.environ["ZERO_AR_DATE"] = "1"
\ No newline at end of file
@@ -1,11 +1,13 @@
 """Tests for artifact building functions in artifacts.py."""
 
+import os
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from src.artifacts import build_libstorage
+from src.artifacts import build_libstorage, clean_build_artifacts
 
 
 class TestBuildLibstorage:
@@ -134,4 +136,179 @@ class TestBuildLibstorage:
         # Verify cwd was set to logos_storage_dir for all make commands
         for call in mock_run.call_args_list:
             if "make" in str(call[0][0]) and len(call) > 1 and 'cwd' in call[1]:
-                assert call[1]['cwd'] == logos_storage_dir
\ No newline at end of file
+                assert call[1]['cwd'] == logos_storage_dir
+
+    def test_build_libstorage_uses_ccache_when_available(self, mock_os_environ):
+        """Test that build_libstorage routes compiles through ccache when it is installed."""
+        logos_storage_dir = Path("/tmp/test")
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            with patch("src.artifacts.shutil.which", return_value="/usr/bin/ccache"):
+                with patch("src.artifacts._IS_WINDOWS", False):
+                    build_libstorage(logos_storage_dir, 4)
+        
+        for call in mock_run.call_args_list:
+            if "make" in str(call[0][0]):
+                assert call[1]['env']['CC'] == "ccache cc"
+                assert call[1]['env']['CXX'] == "ccache c++"
+                assert call[1]['env']['CCACHE_BASEDIR'] == str(logos_storage_dir.resolve())
+
+    def test_build_libstorage_skips_ccache_when_unavailable(self, mock_os_environ):
+        """Test that build_libstorage leaves the compiler alone without ccache."""
+        logos_storage_dir = Path("/tmp/test")
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            with patch("src.artifacts.shutil.which", return_value=None):
+                build_libstorage(logos_storage_dir, 4)
+        
+        for call in mock_run.call_args_list:
+            if "make" in str(call[0][0]):
+                assert "CC" not in call[1]['env']
+                assert "CXX" not in call[1]['env']
+
+    def test_build_libstorage_skips_ccache_on_windows(self, mock_os_environ):
+        """Test that build_libstorage does not wrap cc on Windows, where MinGW may not provide it."""
+        logos_storage_dir = Path("/tmp/test")
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            with patch("src.artifacts.shutil.which", return_value="C:/msys64/usr/bin/ccache"):
+                with patch("src.artifacts._IS_WINDOWS", True):
+                    build_libstorage(logos_storage_dir, 4)
+        
+        for call in mock_run.call_args_list:
+            if "make" in str(call[0][0]):
+                assert "CC" not in call[1]['env']
+                assert "CXX" not in call[1]['env']
+
+    def test_build_libstorage_respects_user_compiler(self, mock_os_environ):
+        """Test that build_libstorage does not override a user-provided CC."""
+        logos_storage_dir = Path("/tmp/test")
+        os.environ["CC"] = "clang"
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            with patch("src.artifacts.shutil.which", return_value="/usr/bin/ccache"):
+                build_libstorage(logos_storage_dir, 4)
+        
+        for call in mock_run.call_args_list:
+            if "make" in str(call[0][0]):
+                assert "CC" not in call[1]['env']
+
+    def test_build_libstorage_limits_load_average(self):
+        """Test that build_libstorage passes a load-average cap to make on Unix."""
+        logos_storage_dir = Path("/tmp/test")
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            with patch("src.artifacts._IS_WINDOWS", False):
+                build_libstorage(logos_storage_dir, 8)
+        
+        libstorage_call = mock_run.call_args_list[-1][0][0]
+        assert "-l" in libstorage_call
+        assert libstorage_call[libstorage_call.index("-l") + 1] == "12.0"
+
+
+class TestDepsStamp:
+    """Test skipping make deps when its inputs and outputs are unchanged."""
+
+    @staticmethod
+    def _run_command_stub(submodule_status):
+        def side_effect(cmd, **kwargs):
+            if cmd[:1] == ["git"]:
+                return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=submodule_status, stderr="")
+            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
+        return side_effect
+
+    @staticmethod
+    def _create_deps_outputs(logos_storage_dir):
+        """Create the files `make deps` would have built."""
+        outputs = [
+            logos_storage_dir / "vendor" / "nimbus-build-system" / "vendor" / "Nim" / "bin" / "nim",
+            logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "libnatpmp-upstream" / "libnatpmp.a",
+            logos_storage_dir / "vendor" / "nim-nat-traversal" / "vendor" / "miniupnp" / "miniupnpc" / "build" / "libminiupnpc.a",
+            logos_storage_dir / "vendor" / "nim-libbacktrace" / "install" / "usr" / "lib" / "libbacktrace.a",
+        ]
+        for path in outputs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+        return outputs
+
+    def test_build_libstorage_writes_deps_stamp(self, temp_dir):
+        """Test that build_libstorage records the deps fingerprint in the checkout's build directory."""
+        with patch("src.artifacts.run_command") as mock_run:
+            mock_run.side_effect = self._run_command_stub(" abc123 vendor/nim-libbacktrace (v1)\n")
+            build_libstorage(temp_dir, 4)
+        
+        deps_calls = [call for call in mock_run.call_args_list if "deps" in call[0][0]]
+        assert len(deps_calls) == 1
+        assert (temp_dir / "build" / ".deps-stamp").exists()
+        assert not (temp_dir / ".deps-stamp").exists()
+
+    @patch("src.artifacts._IS_WINDOWS", False)
+    def test_build_libstorage_skips_deps_when_stamp_matches(self, temp_dir, mock_os_environ):
+        """Test that build_libstorage skips make deps when submodules are unchanged."""
+        self._create_deps_outputs(temp_dir)
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            mock_run.side_effect = self._run_command_stub(" abc123 vendor/nim-libbacktrace (v1)\n")
+            build_libstorage(temp_dir, 4)
+            mock_run.reset_mock()
+            build_libstorage(temp_dir, 4)
+        
+        deps_calls = [call for call in mock_run.call_args_list if "deps" in call[0][0]]
+        assert len(deps_calls) == 0
+
+    @patch("src.artifacts._IS_WINDOWS", False)
+    def test_build_libstorage_runs_deps_when_submodules_change(self, temp_dir):
+        """Test that build_libstorage reruns make deps when the submodule state changes."""
+        self._create_deps_outputs(temp_dir)
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            mock_run.side_effect = self._run_command_stub(" abc123 vendor/nim-libbacktrace (v1)\n")
+            build_libstorage(temp_dir, 4)
+            mock_run.reset_mock()
+            mock_run.side_effect = self._run_command_stub("+def456 vendor/nim-libbacktrace (v2)\n")
+            build_libstorage(temp_dir, 4)
+        
+        deps_calls = [call for call in mock_run.call_args_list if "deps" in call[0][0]]
+        assert len(deps_calls) == 1
+
+    @patch("src.artifacts._IS_WINDOWS", False)
+    def test_build_libstorage_runs_deps_when_toolchain_changes(self, temp_dir, mock_os_environ):
+        """Test that build_libstorage reruns make deps when compiler settings change."""
+        self._create_deps_outputs(temp_dir)
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            mock_run.side_effect = self._run_command_stub(" abc123 vendor/nim-libbacktrace (v1)\n")
+            with patch("src.artifacts.shutil.which", return_value=None):
+                build_libstorage(temp_dir, 4)
+            mock_run.reset_mock()
+            # ccache appearing wraps CC/CXX, which changes what make deps builds
+            with patch("src.artifacts.shutil.which", return_value="/usr/bin/ccache"):
+                build_libstorage(temp_dir, 4)
+        
+        deps_calls = [call for call in mock_run.call_args_list if "deps" in call[0][0]]
+        assert len(deps_calls) == 1
+
+    @patch("src.artifacts._IS_WINDOWS", False)
+    def test_build_libstorage_runs_deps_when_outputs_missing(self, temp_dir, mock_os_environ):
+        """Test that build_libstorage reruns make deps when a deps output was deleted."""
+        outputs = self._create_deps_outputs(temp_dir)
+        
+        with patch("src.artifacts.run_command") as mock_run:
+            mock_run.side_effect = self._run_command_stub(" abc123 vendor/nim-libbacktrace (v1)\n")
+            build_libstorage(temp_dir, 4)
+            mock_run.reset_mock()
+            outputs[0].unlink()
+            build_libstorage(temp_dir, 4)
+        
+        deps_calls = [call for call in mock_run.call_args_list if "deps" in call[0][0]]
+        assert len(deps_calls) == 1
+
+    def test_clean_build_artifacts_removes_deps_stamp(self, temp_dir):
+        """Test that cleaning forces make deps on the next build."""
+        (temp_dir / "build").mkdir()
+        (temp_dir / "build" / ".deps-stamp").write_text("stale")
+        
+        with patch("src.artifacts.run_command"):
+            clean_build_artifacts(temp_dir)
+        
+        assert not (temp_dir / "build" / ".deps-stamp").exists()
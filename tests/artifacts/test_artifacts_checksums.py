@@ -0,0 +1,193 @@
+"""Tests for checksum helpers in artifacts.py."""
+
+import hashlib
+import mmap
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.artifacts import _sha256_file, generate_checksum, verify_checksum
+
+
+class TestSha256File:
+    """Test _sha256_file helper."""
+
+    def test_sha256_file_matches_hashlib(self, temp_dir):
+        """Test that _sha256_file returns the SHA256 hex digest of the file contents."""
+        content = b"fake library content" * 1000
+        path = temp_dir / "libstorage.a"
+        path.write_bytes(content)
+
+        assert _sha256_file(path) == hashlib.sha256(content).hexdigest()
+
+    def test_sha256_file_handles_empty_file(self, temp_dir):
+        """Test that _sha256_file hashes empty files."""
+        path = temp_dir / "empty.a"
+        path.write_bytes(b"")
+
+        assert _sha256_file(path) == hashlib.sha256(b"").hexdigest()
+
+    def test_sha256_file_uses_file_digest_when_available(self, temp_dir):
+        """Test that _sha256_file delegates to hashlib.file_digest when available."""
+        path = temp_dir / "libstorage.a"
+        path.write_bytes(b"fake library content")
+
+        with patch("src.artifacts._HAS_FILE_DIGEST", True):
+            with patch("src.artifacts.hashlib.file_digest", create=True) as mock_digest:
+                mock_digest.return_value.hexdigest.return_value = "digest"
+                result = _sha256_file(path)
+
+        assert result == "digest"
+        mock_digest.assert_called_once()
+        assert mock_digest.call_args[0][1] == "sha256"
+
+    def test_sha256_file_falls_back_to_chunked_reads(self, temp_dir):
+        """Test that _sha256_file streams chunks when hashlib.file_digest is unavailable."""
+        content = b"x" * 300
+        path = temp_dir / "libstorage.a"
+        path.write_bytes(content)
+
+        with patch("src.artifacts._HAS_FILE_DIGEST", False):
+            with patch("src.artifacts._CHUNK_SIZE", 128):
+                result = _sha256_file(path)
+
+        assert result == hashlib.sha256(content).hexdigest()
+
+    def test_sha256_file_memory_maps_large_files(self, temp_dir):
+        """Test that files above the mmap threshold are hashed through a memory map."""
+        content = b"fake library content" * 100
+        path = temp_dir / "libstorage.a"
+        path.write_bytes(content)
+
+        with patch("src.artifacts._MMAP_THRESHOLD", 1024):
+            with patch("src.artifacts.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+                result = _sha256_file(path)
+
+        mock_mmap.assert_called_once()
+        assert result == hashlib.sha256(content).hexdigest()
+
+    def test_sha256_file_does_not_map_small_files(self, temp_dir):
+        """Test that files at or below the mmap threshold are read normally."""
+        path = temp_dir / "libstorage.h"
+        path.write_bytes(b"#pragma once\n")
+
+        with patch("src.artifacts.mmap.mmap") as mock_mmap:
+            result = _sha256_file(path)
+
+        mock_mmap.assert_not_called()
+        assert result == hashlib.sha256(b"#pragma once\n").hexdigest()
+
+    def test_sha256_file_hints_sequential_reads(self, temp_dir):
+        """Test that small files are read with a sequential readahead hint."""
+        path = temp_dir / "libstorage.h"
+        path.write_bytes(b"#pragma once\n")
+
+        with patch("src.artifacts._HAS_FADVISE", True):
+            with patch("src.artifacts.os.posix_fadvise", create=True) as mock_fadvise:
+                with patch("src.artifacts.os.POSIX_FADV_SEQUENTIAL", 2, create=True):
+                    result = _sha256_file(path)
+
+        mock_fadvise.assert_called_once()
+        assert mock_fadvise.call_args[0][1:] == (0, 0, 2)
+        assert result == hashlib.sha256(b"#pragma once\n").hexdigest()
+
+
+class TestGenerateChecksum:
+    """Test generate_checksum function."""
+
+    def test_generate_checksum_writes_sha256sum_format(self, temp_dir):
+        """Test that generate_checksum writes `<digest>  <name>` next to the artifact."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+
+        generate_checksum(artifact_path)
+
+        checksum_path = temp_dir / "libstorage.a.sha256"
+        expected = hashlib.sha256(b"fake library content").hexdigest()
+        assert checksum_path.read_text() == f"{expected}  libstorage.a\n"
+
+    def test_generate_checksum_returns_digest(self, temp_dir):
+        """Test that generate_checksum returns the digest it wrote."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+
+        digest = generate_checksum(artifact_path)
+
+        assert digest == hashlib.sha256(b"fake library content").hexdigest()
+
+
+class TestVerifyChecksum:
+    """Test verify_checksum function."""
+
+    def test_verify_checksum_accepts_generated_checksum(self, temp_dir):
+        """Test that verify_checksum accepts the file written by generate_checksum."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+        generate_checksum(artifact_path)
+
+        with patch("src.artifacts.run_command") as mock_run:
+            assert verify_checksum(artifact_path) is True
+
+        mock_run.assert_not_called()
+
+    def test_verify_checksum_detects_modified_artifact(self, temp_dir):
+        """Test that verify_checksum fails when the artifact changed after hashing."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+        generate_checksum(artifact_path)
+        artifact_path.write_bytes(b"tampered library content")
+
+        with pytest.raises(ValueError, match="Checksum verification failed"):
+            verify_checksum(artifact_path)
+
+    def test_verify_checksum_accepts_precomputed_hash(self, temp_dir):
+        """Test that verify_checksum uses a given expected hash without a .sha256 file."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+        expected = hashlib.sha256(b"fake library content").hexdigest()
+
+        assert verify_checksum(artifact_path, expected) is True
+        assert not artifact_path.with_suffix(".a.sha256").exists()
+
+    def test_verify_checksum_rejects_wrong_precomputed_hash(self, temp_dir):
+        """Test that verify_checksum fails when the given expected hash does not match."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+
+        with pytest.raises(ValueError, match="Checksum verification failed"):
+            verify_checksum(artifact_path, "0" * 64)
+
+    def test_verify_checksum_rejects_malformed_hash(self, temp_dir):
+        """Test that a non-hex expected hash fails verification with ValueError."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+
+        with pytest.raises(ValueError, match="Checksum verification failed"):
+            verify_checksum(artifact_path, "\u00e9" * 64)
+
+    def test_verify_checksum_rehashes_file_with_unchanged_metadata(self, temp_dir):
+        """Test that a same-size rewrite with its mtime restored still fails verification."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+        digest = generate_checksum(artifact_path)
+        st = artifact_path.stat()
+        artifact_path.write_bytes(b"FAKE LIBRARY CONTENT")
+        os.utime(artifact_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        with pytest.raises(ValueError, match="Checksum verification failed"):
+            verify_checksum(artifact_path, digest)
+
+    def test_verify_checksum_rehashes_after_modification(self, temp_dir):
+        """Test that a file changed since it was last hashed is hashed again."""
+        artifact_path = temp_dir / "libstorage.a"
+        artifact_path.write_bytes(b"fake library content")
+        digest = generate_checksum(artifact_path)
+        artifact_path.write_bytes(b"tampered library content")
+        
+        with patch("src.artifacts._sha256_file", wraps=_sha256_file) as mock_hash:
+            with pytest.raises(ValueError, match="Checksum verification failed"):
+                verify_checksum(artifact_path, digest)
+        
+        mock_hash.assert_called_once_with(artifact_path)
@@ -6,7 +6,7 @@ from unittest.mock import patch, Mock
 
 import pytest
 
-from src.artifacts import clean_build_artifacts
+from src.artifacts import _remove_object_files, clean_build_artifacts
 
 
 class TestCleanBuildArtifacts:
@@ -39,24 +39,59 @@ class TestCleanBuildArtifacts:
         # Verify build directories were removed (at least 5)
         assert mock_rmtree.call_count >= 5
 
-    def test_clean_build_artifacts_removes_o_files(self):
+    def test_clean_build_artifacts_removes_o_files(self, temp_dir):
         """Test that clean_build_artifacts removes .o files."""
-        logos_storage_dir = Path("/tmp/test")
+        natpmp_dir = temp_dir / "vendor" / "nim-nat-traversal" / "vendor" / "libnatpmp-upstream"
+        miniupnpc_dir = temp_dir / "vendor" / "nim-nat-traversal" / "vendor" / "miniupnp" / "miniupnpc"
+        (miniupnpc_dir / "src").mkdir(parents=True)
+        natpmp_dir.mkdir(parents=True)
         
-        mock_path1 = Mock()
-        mock_path1.unlink = Mock()
-        mock_path2 = Mock()
-        mock_path2.unlink = Mock()
+        object_files = [natpmp_dir / "natpmp.o", miniupnpc_dir / "src" / "miniupnpc.o"]
+        for path in object_files:
+            path.write_bytes(b"object")
+        source_file = natpmp_dir / "natpmp.c"
+        source_file.write_text("int main(void) { return 0; }")
         
-        with patch("shutil.rmtree"):
-            with patch("pathlib.Path.exists", return_value=True):
-                with patch("pathlib.Path.rglob") as mock_rglob:
-                    mock_rglob.return_value = [mock_path1, mock_path2]
-                    clean_build_artifacts(logos_storage_dir)
+        with patch.dict(os.environ, {"HOME": str(temp_dir)}):
+            with patch("src.artifacts.run_command"):
+                clean_build_artifacts(temp_dir)
+        
+        # Verify .o files were unlinked and sources kept
+        assert not any(path.exists() for path in object_files)
+        assert source_file.exists()
+
+    @pytest.mark.parametrize("has_fwalk", [True, False])
+    def test_remove_object_files_walk_variants(self, temp_dir, has_fwalk):
+        """Test that .o cleanup gives the same result with and without os.fwalk."""
+        if has_fwalk and not hasattr(os, "fwalk"):
+            pytest.skip("os.fwalk is not available on this platform")
+        (temp_dir / "a" / "b").mkdir(parents=True)
+        object_file = temp_dir / "a" / "b" / "miniupnpc.o"
+        object_file.write_bytes(b"object")
+        header_file = temp_dir / "a" / "miniupnpc.h"
+        header_file.write_text("/* header */")
+        
+        with patch("src.artifacts._HAS_FWALK", has_fwalk):
+            _remove_object_files(temp_dir)
         
-        # Verify .o files were unlinked
-        assert mock_path1.unlink.called
-        assert mock_path2.unlink.called
+        assert not object_file.exists()
+        assert header_file.exists()
+
+    def test_clean_build_artifacts_removes_build_directories_contents(self, temp_dir):
+        """Test that clean_build_artifacts removes existing build trees from disk."""
+        build_dir = temp_dir / "build"
+        nimcache_dir = temp_dir / "nimcache" / "release"
+        for dir_path in [build_dir, nimcache_dir]:
+            (dir_path / "sub").mkdir(parents=True)
+            (dir_path / "sub" / "file.o").write_bytes(b"object")
+        
+        with patch.dict(os.environ, {"HOME": str(temp_dir)}):
+            with patch("src.artifacts.run_command"):
+                clean_build_artifacts(temp_dir)
+        
+        assert not build_dir.exists()
+        assert not nimcache_dir.exists()
+        assert (temp_dir / "nimcache").exists()
 
     def test_clean_build_artifacts_restores_gitkeep(self):
         """Test that clean_build_artifacts restores .gitkeep files."""
@@ -73,6 +108,9 @@ class TestCleanBuildArtifacts:
             if "git" in str(call[0][0]) and "restore" in str(call[0][0]) and ".gitkeep" in str(call[0][0])
         ]
         assert len(gitkeep_calls) == 1
+        assert gitkeep_calls[0][0][0] == [
+            "git", "-C", str(logos_storage_dir / "vendor" / "nim-leveldbstatic"), "restore", "build/.gitkeep"
+        ]
 
     def test_clean_build_artifacts_skips_nonexistent_cache(self):
         """Test that clean_build_artifacts skips nonexistent cache directory."""
@@ -85,4 +123,12 @@ class TestCleanBuildArtifacts:
                 clean_build_artifacts(logos_storage_dir)
         
         # Verify directories were removed (cache was skipped)
-        assert mock_rmtree.call_count >= 5
\ No newline at end of file
+        assert mock_rmtree.call_count >= 5
+
+    def test_clean_build_artifacts_tolerates_missing_directories(self, temp_dir):
+        """Test that clean_build_artifacts succeeds on a tree with nothing to clean."""
+        with patch.dict(os.environ, {"HOME": str(temp_dir)}):
+            with patch("src.artifacts.run_command"):
+                clean_build_artifacts(temp_dir)
+        
+        assert list(temp_dir.iterdir()) == []
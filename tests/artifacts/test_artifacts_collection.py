@@ -32,8 +32,8 @@ class TestCollectArtifacts:
 
         assert "libstorage.a not found" in str(exc_info.value)
 
-    @patch('src.artifacts.platform.system', return_value='Linux')
-    def test_collect_artifacts_uses_build_subdirectory_on_linux(self, mock_system, sample_artifact_paths):
+    @patch('src.artifacts._IS_WINDOWS', False)
+    def test_collect_artifacts_uses_build_subdirectory_on_linux(self, sample_artifact_paths):
         """Test that collect_artifacts uses build/ subdirectory for libminiupnpc.a on Linux."""
         def mock_path_exists(path: Path) -> bool:
             # Only return True for the Linux path (with build/ subdirectory)
@@ -47,8 +47,8 @@ class TestCollectArtifacts:
         assert len(miniupnpc_lib) == 1
         assert "build/libminiupnpc.a" in str(miniupnpc_lib[0])
 
-    @patch('src.artifacts.platform.system', return_value='Windows')
-    def test_collect_artifacts_uses_root_directory_on_windows(self, mock_system, sample_artifact_paths):
+    @patch('src.artifacts._IS_WINDOWS', True)
+    def test_collect_artifacts_uses_root_directory_on_windows(self, sample_artifact_paths):
         """Test that collect_artifacts uses root directory for libminiupnpc.a on Windows."""
         def mock_path_exists(path: Path) -> bool:
             # Only return True for the Windows path (without build/ subdirectory)
@@ -1,20 +1,21 @@
 """Tests for library copying function in artifacts.py."""
 
+import errno
 import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-from src.artifacts import copy_libraries
+from src.artifacts import _fast_copy, copy_libraries
 
 
 class TestCopyLibraries:
     """Test copy_libraries function."""
 
-    @patch("shutil.copy2")
+    @patch("src.artifacts._fast_copy")
     @patch("pathlib.Path.mkdir")
-    def test_copy_libraries_copies_all_libraries(self, mock_mkdir, mock_copy2, temp_dir):
+    def test_copy_libraries_copies_all_libraries(self, mock_mkdir, mock_copy, temp_dir):
         """Test that copy_libraries copies all input libraries."""
         libraries = [
             temp_dir / "lib1.a",
@@ -27,11 +28,11 @@ class TestCopyLibraries:
         
         # Verify all libraries were copied
         assert len(result) == 3
-        assert mock_copy2.call_count == 3
+        assert mock_copy.call_count == 3
 
-    @patch("shutil.copy2")
+    @patch("src.artifacts._fast_copy")
     @patch("pathlib.Path.mkdir")
-    def test_copy_libraries_preserves_library_names(self, mock_mkdir, mock_copy2, temp_dir):
+    def test_copy_libraries_preserves_library_names(self, mock_mkdir, mock_copy, temp_dir):
         """Test that copy_libraries preserves library names."""
         libraries = [
             temp_dir / "libstorage.a",
@@ -45,20 +46,20 @@ class TestCopyLibraries:
         assert result[0].name == "libstorage.a"
         assert result[1].name == "libnatpmp.a"
 
-    @patch("shutil.copy2")
-    def test_copy_libraries_creates_output_directory(self, mock_copy2, temp_dir):
+    @patch("src.artifacts._fast_copy")
+    def test_copy_libraries_creates_output_directory(self, mock_copy, temp_dir):
         """Test that copy_libraries creates output directory if needed."""
         libraries = [temp_dir / "lib1.a"]
         output_dir = temp_dir / "output"
         
         copy_libraries(libraries, output_dir)
         
-        # Verify copy2 was called (shutil.copy2 creates parent directories automatically)
-        assert mock_copy2.call_count == 1
+        # Verify the copy was made
+        assert mock_copy.call_count == 1
 
-    @patch("shutil.copy2", side_effect=FileNotFoundError("Source not found"))
+    @patch("src.artifacts._fast_copy", side_effect=FileNotFoundError("Source not found"))
     @patch("pathlib.Path.mkdir")
-    def test_copy_libraries_propagates_file_not_found_error(self, mock_mkdir, mock_copy2, temp_dir):
+    def test_copy_libraries_propagates_file_not_found_error(self, mock_mkdir, mock_copy, temp_dir):
         """Test that copy_libraries propagates FileNotFoundError."""
         libraries = [temp_dir / "lib1.a"]
         output_dir = temp_dir / "output"
@@ -68,9 +69,9 @@ class TestCopyLibraries:
         
         assert "Source not found" in str(exc_info.value)
 
-    @patch("shutil.copy2")
+    @patch("src.artifacts._fast_copy")
     @patch("pathlib.Path.mkdir")
-    def test_copy_libraries_returns_correct_paths(self, mock_mkdir, mock_copy2, temp_dir):
+    def test_copy_libraries_returns_correct_paths(self, mock_mkdir, mock_copy, temp_dir):
         """Test that copy_libraries returns correct destination paths."""
         libraries = [
             temp_dir / "libstorage.a",
@@ -85,9 +86,9 @@ class TestCopyLibraries:
         assert result[0] == output_dir / "libstorage.a"
         assert result[1] == output_dir / "libnatpmp.a"
 
-    @patch("shutil.copy2")
+    @patch("src.artifacts._fast_copy")
     @patch("pathlib.Path.mkdir")
-    def test_copy_libraries_handles_empty_list(self, mock_mkdir, mock_copy2, temp_dir):
+    def test_copy_libraries_handles_empty_list(self, mock_mkdir, mock_copy, temp_dir):
         """Test that copy_libraries handles empty library list."""
         libraries = []
         output_dir = temp_dir / "output"
@@ -96,4 +97,118 @@ class TestCopyLibraries:
         
         # Verify empty list is handled correctly
         assert len(result) == 0
-        assert mock_copy2.call_count == 0
\ No newline at end of file
+        assert mock_copy.call_count == 0
+
+    def test_copy_libraries_copies_contents_without_linking(self, temp_dir):
+        """Test that copy_libraries writes independent copies of every library."""
+        src_dir = temp_dir / "build"
+        src_dir.mkdir()
+        output_dir = temp_dir / "output"
+        output_dir.mkdir()
+        libraries = []
+        for name in ["libstorage.a", "libnatpmp.a", "libminiupnpc.a", "libbacktrace.a"]:
+            lib_path = src_dir / name
+            lib_path.write_bytes(name.encode() * 100)
+            libraries.append(lib_path)
+        
+        result = copy_libraries(libraries, output_dir)
+        
+        assert result == [output_dir / lib.name for lib in libraries]
+        for lib_path, dest_path in zip(libraries, result):
+            assert dest_path.read_bytes() == lib_path.read_bytes()
+            assert dest_path.stat().st_ino != lib_path.stat().st_ino
+
+
+class TestFastCopy:
+    """Test _fast_copy helper."""
+
+    def test_fast_copy_copies_contents(self, temp_dir):
+        """Test that _fast_copy writes an identical, independent file."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content" * 1000)
+        dst = temp_dir / "copy.a"
+        
+        _fast_copy(src, dst)
+        
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_ino != src.stat().st_ino
+
+    def test_fast_copy_handles_empty_file(self, temp_dir):
+        """Test that _fast_copy copies empty files."""
+        src = temp_dir / "empty.a"
+        src.write_bytes(b"")
+        dst = temp_dir / "copy.a"
+        
+        _fast_copy(src, dst)
+        
+        assert dst.read_bytes() == b""
+
+    def test_fast_copy_falls_back_when_copy_file_range_unsupported(self, temp_dir):
+        """Test that _fast_copy uses shutil.copyfile when the kernel cannot copy the range."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content")
+        dst = temp_dir / "copy.a"
+        
+        with patch("src.artifacts._HAS_COPY_FILE_RANGE", True):
+            with patch("os.copy_file_range", create=True, side_effect=OSError(errno.EXDEV, "cross-device")):
+                with patch("shutil.copyfile", wraps=shutil.copyfile) as mock_copyfile:
+                    _fast_copy(src, dst)
+        
+        mock_copyfile.assert_called_once_with(src, dst)
+        assert dst.read_bytes() == b"fake library content"
+
+    def test_fast_copy_falls_back_when_copy_file_range_copies_nothing(self, temp_dir):
+        """Test that _fast_copy uses shutil.copyfile when copy_file_range returns 0 at once."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content")
+        dst = temp_dir / "copy.a"
+        
+        with patch("src.artifacts._HAS_COPY_FILE_RANGE", True):
+            with patch("os.copy_file_range", create=True, return_value=0):
+                with patch("shutil.copyfile", wraps=shutil.copyfile) as mock_copyfile:
+                    _fast_copy(src, dst)
+        
+        mock_copyfile.assert_called_once_with(src, dst)
+        assert dst.read_bytes() == b"fake library content"
+
+    def test_fast_copy_raises_on_short_copy(self, temp_dir):
+        """Test that _fast_copy raises when copy_file_range stops after a partial copy."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content")
+        dst = temp_dir / "copy.a"
+        
+        with patch("src.artifacts._HAS_COPY_FILE_RANGE", True):
+            with patch("os.copy_file_range", create=True, side_effect=[4, 0]):
+                with patch("shutil.copyfile") as mock_copyfile:
+                    with pytest.raises(OSError, match="stopped after 4 of 20 bytes"):
+                        _fast_copy(src, dst)
+        
+        mock_copyfile.assert_not_called()
+
+    def test_fast_copy_uses_copyfile_without_copy_file_range(self, temp_dir):
+        """Test that _fast_copy uses shutil.copyfile on platforms without copy_file_range."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content")
+        dst = temp_dir / "copy.a"
+        
+        with patch("src.artifacts._HAS_COPY_FILE_RANGE", False):
+            with patch("shutil.copyfile", wraps=shutil.copyfile) as mock_copyfile:
+                _fast_copy(src, dst)
+        
+        mock_copyfile.assert_called_once_with(src, dst)
+        assert dst.read_bytes() == b"fake library content"
+
+    def test_fast_copy_raises_for_missing_source(self, temp_dir):
+        """Test that _fast_copy propagates FileNotFoundError for a missing source."""
+        with pytest.raises(FileNotFoundError):
+            _fast_copy(temp_dir / "missing.a", temp_dir / "copy.a")
+
+    def test_fast_copy_refuses_to_copy_file_onto_itself(self, temp_dir):
+        """Test that _fast_copy raises SameFileError instead of truncating the source."""
+        src = temp_dir / "libstorage.a"
+        src.write_bytes(b"fake library content")
+
+        with pytest.raises(shutil.SameFileError):
+            _fast_copy(src, src)
+
+        assert src.read_bytes() == b"fake library content"
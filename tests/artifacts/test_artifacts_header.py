@@ -1,5 +1,6 @@
 """Tests for header file handling in artifacts.py."""
 
+import hashlib
 import os
 import subprocess
 from pathlib import Path
@@ -21,11 +22,11 @@ class TestHeaderFileHandling:
         # Configure exists to return True for header source
         mock_path_exists.return_value = True
         
-        with patch("shutil.copy2") as mock_copy:
+        with patch("src.artifacts._fast_copy") as mock_copy:
             header_dest = copy_header_file(logos_storage_dir, dist_dir)
         
-        # Verify shutil.copy2 was called
-        mock_copy.assert_called_once()
+        # Verify the header went through the same copy path as the libraries
+        mock_copy.assert_called_once_with(header_source, dist_dir / "libstorage.h")
         assert header_dest.name == "libstorage.h"
 
     def test_copy_header_file_missing(self, logos_storage_dir, dist_dir, mock_path_exists):
@@ -43,10 +44,10 @@ class TestHeaderFileHandling:
         # Configure exists to return True for header source
         mock_path_exists.return_value = True
         
-        with patch("shutil.copy2") as mock_copy:
+        with patch("src.artifacts._fast_copy") as mock_copy:
             header_dest = copy_header_file(logos_storage_dir, dist_dir)
         
-        # Verify shutil.copy2 was called (it will overwrite by default)
+        # Verify _fast_copy was called (it truncates the destination)
         mock_copy.assert_called_once()
         assert header_dest.name == "libstorage.h"
 
@@ -54,40 +55,13 @@ class TestHeaderFileHandling:
 class TestSHA256SumsGeneration:
     """Test SHA256SUMS.txt generation."""
 
-    def test_generate_sha256sums_with_multiple_files(self, dist_dir, mock_directory_operations, mock_file_writing, mock_sha256sum_commands):
+    def test_generate_sha256sums_with_multiple_files(self, dist_dir):
         """Test SHA256SUMS.txt generation with multiple files."""
-        # Create mock file paths
-        lib_file = dist_dir / "libstorage.a"
-        header_file = dist_dir / "libstorage.h"
-        
-        # Configure iterdir to return mock files
-        mock_directory_operations["iterdir"].return_value = [lib_file, header_file]
-        mock_directory_operations["is_file"].return_value = True
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
+        (dist_dir / "libstorage.h").write_bytes(b"fake header content")
         
-        # Configure sha256sum responses
-        def sha256sum_side_effect(cmd, check=True, binary=False):
-            if "libstorage.a" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="abc123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/libstorage.a\n",
-                    stderr=""
-                )
-            elif "libstorage.h" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="fed654cba321789fed654cba321789fed654cba321789fed654cba321789fed6  /full/path/libstorage.h\n",
-                    stderr=""
-                )
-            return subprocess.CompletedProcess(returncode=0, stdout="", stderr="")
-        
-        mock_sha256sum_commands.side_effect = sha256sum_side_effect
         checksums_path = generate_sha256sums(dist_dir)
-        
-        # Verify write_text was called
-        mock_file_writing["write_text"].assert_called_once()
-        written_content = mock_file_writing["write_text"].call_args[0][0]
+        written_content = checksums_path.read_text()
         
         # Verify checksums file contains entries for both files
         assert "libstorage.a" in written_content
@@ -102,26 +76,22 @@ class TestSHA256SumsGeneration:
             assert len(parts) == 2  # checksum and filename
             assert len(parts[0]) == 64  # SHA256 is 64 hex chars
 
-    def test_generate_sha256sums_with_single_file(self, dist_dir, mock_directory_operations, mock_file_writing, mock_sha256sum_commands):
-        """Test SHA256SUMS.txt generation with single file."""
-        # Create mock file path
-        lib_file = dist_dir / "libstorage.a"
+    def test_generate_sha256sums_matches_hashlib_digest(self, dist_dir):
+        """Test that generate_sha256sums writes the real SHA256 digest of each file."""
+        content = b"fake library content"
+        (dist_dir / "libstorage.a").write_bytes(content)
         
-        # Configure iterdir to return mock file
-        mock_directory_operations["iterdir"].return_value = [lib_file]
-        mock_directory_operations["is_file"].return_value = True
+        checksums_path = generate_sha256sums(dist_dir)
         
-        mock_sha256sum_commands.return_value = subprocess.CompletedProcess(
-            args=["sha256sum"],
-            returncode=0,
-            stdout="abc123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/libstorage.a\n",
-            stderr=""
-        )
+        expected = hashlib.sha256(content).hexdigest()
+        assert checksums_path.read_text() == f"{expected}  libstorage.a\n"
+
+    def test_generate_sha256sums_with_single_file(self, dist_dir):
+        """Test SHA256SUMS.txt generation with single file."""
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
         
         checksums_path = generate_sha256sums(dist_dir)
-        
-        # Verify write_text was called
-        written_content = mock_file_writing["write_text"].call_args[0][0]
+        written_content = checksums_path.read_text()
         
         # Verify checksums file contains entry for the file
         assert "libstorage.a" in written_content
@@ -130,50 +100,23 @@ class TestSHA256SumsGeneration:
         lines = written_content.strip().split('\n')
         assert len(lines) == 1
 
-    def test_generate_sha256sums_raises_when_no_files(self, dist_dir, mock_directory_operations):
+    def test_generate_sha256sums_raises_when_no_files(self, dist_dir):
         """Test that generate_sha256sums raises FileNotFoundError when no files exist."""
-        # Configure iterdir to return empty list
-        mock_directory_operations["iterdir"].return_value = []
+        (dist_dir / "subdir").mkdir()
         
         with pytest.raises(FileNotFoundError) as exc_info:
             generate_sha256sums(dist_dir)
         
         assert "No files found" in str(exc_info.value)
 
-    def test_generate_sha256sums_excludes_existing_checksums_file(self, dist_dir, mock_directory_operations, mock_file_writing, mock_sha256sum_commands):
+    def test_generate_sha256sums_excludes_existing_checksums_file(self, dist_dir):
         """Test that generate_sha256sums excludes existing SHA256SUMS.txt from checksums."""
-        # Create mock file paths
-        lib_file = dist_dir / "libstorage.a"
-        header_file = dist_dir / "libstorage.h"
-        checksums_file = dist_dir / "SHA256SUMS.txt"
-        
-        # Configure iterdir to return mock files including checksums file
-        mock_directory_operations["iterdir"].return_value = [lib_file, header_file, checksums_file]
-        mock_directory_operations["is_file"].return_value = True
-        
-        # Configure sha256sum responses
-        def sha256sum_side_effect(cmd, check=True, binary=False):
-            if "libstorage.a" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="abc123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/libstorage.a\n",
-                    stderr=""
-                )
-            elif "libstorage.h" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="fed654cba321789fed654cba321789fed654cba321789fed654cba321789fed6  /full/path/libstorage.h\n",
-                    stderr=""
-                )
-            return subprocess.CompletedProcess(returncode=0, stdout="", stderr="")
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
+        (dist_dir / "libstorage.h").write_bytes(b"fake header content")
+        (dist_dir / "SHA256SUMS.txt").write_text("stale checksums\n")
         
-        mock_sha256sum_commands.side_effect = sha256sum_side_effect
         checksums_path = generate_sha256sums(dist_dir)
-        
-        # Verify write_text was called
-        written_content = mock_file_writing["write_text"].call_args[0][0]
+        written_content = checksums_path.read_text()
         
         # Verify only libstorage.a and libstorage.h are included (not SHA256SUMS.txt)
         lines = written_content.strip().split('\n')
@@ -182,48 +125,14 @@ class TestSHA256SumsGeneration:
         assert "libstorage.h" in written_content
         assert "SHA256SUMS.txt" not in written_content
 
-    def test_generate_sha256sums_files_sorted_alphabetically(self, dist_dir, mock_directory_operations, mock_file_writing, mock_sha256sum_commands):
+    def test_generate_sha256sums_files_sorted_alphabetically(self, dist_dir):
         """Test that generate_sha256sums sorts files alphabetically."""
-        # Create mock file paths in non-alphabetical order
-        z_file = dist_dir / "z_file.txt"
-        a_file = dist_dir / "a_file.txt"
-        m_file = dist_dir / "m_file.txt"
-        
-        # Configure iterdir to return files in non-alphabetical order
-        mock_directory_operations["iterdir"].return_value = [z_file, a_file, m_file]
-        mock_directory_operations["is_file"].return_value = True
-        
-        # Configure sha256sum responses
-        def sha256sum_side_effect(cmd, check=True, binary=False):
-            if "z_file.txt" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="zzz123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/z_file.txt\n",
-                    stderr=""
-                )
-            elif "a_file.txt" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="aaa123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/a_file.txt\n",
-                    stderr=""
-                )
-            elif "m_file.txt" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="mmm123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/m_file.txt\n",
-                    stderr=""
-                )
-            return subprocess.CompletedProcess(returncode=0, stdout="", stderr="")
+        # Create files in non-alphabetical order
+        for name in ["z_file.txt", "a_file.txt", "m_file.txt"]:
+            (dist_dir / name).write_text(name)
         
-        mock_sha256sum_commands.side_effect = sha256sum_side_effect
         checksums_path = generate_sha256sums(dist_dir)
-        
-        # Verify write_text was called
-        written_content = mock_file_writing["write_text"].call_args[0][0]
-        lines = written_content.strip().split('\n')
+        lines = checksums_path.read_text().strip().split('\n')
         
         # Extract filenames
         filenames = [line.split()[1] for line in lines]
@@ -231,40 +140,13 @@ class TestSHA256SumsGeneration:
         # Verify alphabetical order
         assert filenames == ["a_file.txt", "m_file.txt", "z_file.txt"]
 
-    def test_generate_sha256sums_uses_relative_paths_for_verification(self, dist_dir, mock_directory_operations, mock_file_writing, mock_sha256sum_commands):
+    def test_generate_sha256sums_uses_relative_paths_for_verification(self, dist_dir):
         """Test that generate_sha256sums uses relative paths so sha256sum -c works from within the directory."""
-        # Create mock file paths
-        lib_file = dist_dir / "libstorage.a"
-        header_file = dist_dir / "libstorage.h"
-        
-        # Configure iterdir to return mock files
-        mock_directory_operations["iterdir"].return_value = [lib_file, header_file]
-        mock_directory_operations["is_file"].return_value = True
-        
-        # Configure sha256sum responses with full paths
-        def sha256sum_side_effect(cmd, check=True, binary=False):
-            if "libstorage.a" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="abc123def456789abc123def456789abc123def456789abc123def456789abc1  /full/path/libstorage.a\n",
-                    stderr=""
-                )
-            elif "libstorage.h" in str(cmd):
-                return subprocess.CompletedProcess(
-                    args=["sha256sum"],
-                    returncode=0,
-                    stdout="fed654cba321789fed654cba321789fed654cba321789fed654cba321789fed6  /full/path/libstorage.h\n",
-                    stderr=""
-                )
-            return subprocess.CompletedProcess(returncode=0, stdout="", stderr="")
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
+        (dist_dir / "libstorage.h").write_bytes(b"fake header content")
         
-        mock_sha256sum_commands.side_effect = sha256sum_side_effect
         checksums_path = generate_sha256sums(dist_dir)
-        
-        # Verify write_text was called
-        written_content = mock_file_writing["write_text"].call_args[0][0]
-        lines = written_content.strip().split('\n')
+        lines = checksums_path.read_text().strip().split('\n')
         
         for line in lines:
             parts = line.split()
@@ -275,4 +157,33 @@ class TestSHA256SumsGeneration:
             assert filename in ["libstorage.a", "libstorage.h"]
             # Should not contain directory separators
             assert "/" not in filename
-            assert "\\" not in filename
\ No newline at end of file
+            assert "\\" not in filename
+
+    def test_generate_sha256sums_does_not_spawn_subprocesses(self, dist_dir, mock_run_command):
+        """Test that generate_sha256sums hashes files without external tools."""
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
+        
+        generate_sha256sums(dist_dir)
+        
+        mock_run_command.assert_not_called()
+
+    def test_generate_sha256sums_with_explicit_files_skips_directory_scan(self, dist_dir):
+        """Test that an explicit file list is checksummed without listing the directory."""
+        (dist_dir / "libstorage.a").write_bytes(b"fake library content")
+        (dist_dir / "libstorage.h").write_bytes(b"fake header content")
+        (dist_dir / "stale.a").write_bytes(b"left over from an earlier build")
+        
+        with patch("src.artifacts.os.scandir") as mock_scandir:
+            checksums_path = generate_sha256sums(
+                dist_dir,
+                files=[dist_dir / "libstorage.h", dist_dir / "libstorage.a"]
+            )
+        
+        mock_scandir.assert_not_called()
+        filenames = [line.split()[1] for line in checksums_path.read_text().strip().split('\n')]
+        assert filenames == ["libstorage.a", "libstorage.h"]
+
+    def test_generate_sha256sums_raises_when_explicit_files_empty(self, dist_dir):
+        """Test that an empty explicit file list is rejected like an empty directory."""
+        with pytest.raises(FileNotFoundError, match="No files found"):
+            generate_sha256sums(dist_dir, files=[])
@@ -7,7 +7,7 @@ of the called functions.
 
 import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, Mock, call
 from dataclasses import dataclass
 
 import pytest
@@ -38,6 +38,20 @@ class TestMainOrchestration:
         
         mock_build_setup["mock_config"].assert_called_once()
 
+    def test_main_configures_environment_after_checkout(self, mock_build_setup):
+        """Test that main() derives the environment from the checked-out repository."""
+        manager = Mock()
+        manager.attach_mock(mock_build_setup["mock_repo"], "ensure_logos_storage_repo")
+        manager.attach_mock(mock_build_setup["mock_config"], "configure_reproducible_environment")
+        
+        main()
+        
+        assert [c[0] for c in manager.mock_calls] == [
+            "ensure_logos_storage_repo",
+            "configure_reproducible_environment",
+        ]
+        mock_build_setup["mock_config"].assert_called_once_with(mock_build_setup["logos_storage_dir"], 1700000000)
+
     def test_main_calls_ensure_logos_storage_repo_with_default_branch(self, mock_build_setup):
         """Test that main() calls ensure_logos_storage_repo() with default branch."""
         with patch.dict(os.environ, {}, clear=False):
@@ -150,21 +164,24 @@ class TestMainOrchestration:
         # Verify call order
         expected_calls = [
             call.get_platform_identifier(),
-            call.configure_reproducible_environment(),
             call.ensure_logos_storage_repo("master", None),
+            call.configure_reproducible_environment(mock_build_setup["logos_storage_dir"], 1700000000),
             call.get_parallel_jobs(),
             call.build_libstorage(mock_build_setup["logos_storage_dir"], 4),
             call.get_host_triple(),
             call.collect_artifacts(mock_build_setup["logos_storage_dir"], "x86_64"),
             call.copy_libraries([], Path("dist/master-abc123d-linux-amd64")),
             call.copy_header_file(mock_build_setup["logos_storage_dir"], Path("dist/master-abc123d-linux-amd64")),
-            call.generate_sha256sums(Path("dist/master-abc123d-linux-amd64")),
+            call.generate_sha256sums(
+                Path("dist/master-abc123d-linux-amd64"),
+                files=[mock_build_setup["mock_copy"].return_value]
+            ),
         ]
         
         # Check that all mocks were called in the expected order
         assert mock_build_setup["mock_platform"].call_args_list == [expected_calls[0]]
-        assert mock_build_setup["mock_config"].call_args_list == [expected_calls[1]]
-        assert mock_build_setup["mock_repo"].call_args_list == [expected_calls[2]]
+        assert mock_build_setup["mock_repo"].call_args_list == [expected_calls[1]]
+        assert mock_build_setup["mock_config"].call_args_list == [expected_calls[2]]
         assert mock_build_setup["mock_jobs"].call_args_list == [expected_calls[3]]
         assert mock_build_setup["mock_build"].call_args_list == [expected_calls[4]]
         assert mock_build_setup["mock_triple"].call_args_list == [expected_calls[5]]
@@ -20,7 +20,6 @@ from tests.fixtures.system_commands import (
     mock_run_command,
     mock_utils_run_command,
     mock_ar_commands,
-    mock_sha256sum_commands,
     mock_file_commands,
 )
 from tests.fixtures.build import mock_build_setup
@@ -30,6 +29,19 @@ from tests.fixtures.repository import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset memoized lookups so each test sees its own mocked responses."""
+    from src.repository import _fetch_remote_tags
+    from src.utils import _cpu_count, get_host_triple, get_platform_identifier
+    caches = (_fetch_remote_tags, _cpu_count, get_host_triple, get_platform_identifier)
+    for cached in caches:
+        cached.cache_clear()
+    yield
+    for cached in caches:
+        cached.cache_clear()
+
+
 @dataclass
 class MockCompletedProcess:
     """Mock subprocess.CompletedProcess for testing."""
@@ -161,11 +173,3 @@ def mock_clean_setup():
                 "mock_clean": mock_clean,
             }
 
-
-@pytest.fixture
-def mock_artifact_collection_setup():
-    """Fixture that provides common mocks for artifact collection tests."""
-    with patch("src.artifacts.check_artifact_compatibility", return_value=True) as mock_check:
-        yield {
-            "mock_check": mock_check,
-        }
\ No newline at end of file
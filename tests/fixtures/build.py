@@ -10,7 +10,7 @@ from src.repository import CommitInfo
 def mock_build_setup():
     """Fixture that provides common mocks for build.py main() function."""
     logos_storage_dir = Path("logos-storage-nim")
-    mock_commit_info = CommitInfo("abc123def456789abc123def456789abc123def", "abc123d", "master")
+    mock_commit_info = CommitInfo("abc123def456789abc123def456789abc123def", "abc123d", "master", 1700000000)
     
     with patch("build.get_platform_identifier", return_value="linux-amd64") as mock_platform:
         with patch("build.configure_reproducible_environment") as mock_config:
@@ -9,9 +9,7 @@ def mock_git_clone_responses():
     """Fixture that provides standard git clone subprocess responses."""
     return [
         subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git clone
-        subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # git rev-parse HEAD
-        subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # git rev-parse --short HEAD
-        subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),  # git rev-parse --abbrev-ref HEAD
+        subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> master\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
     ]
 
 
@@ -20,8 +18,8 @@ def mock_git_update_responses():
     """Fixture that provides standard git update subprocess responses."""
     return [
         subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git fetch origin
-        subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git show-ref local branch
-        subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git show-ref remote branch
+        subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # git rev-parse --is-shallow-repository
+        subprocess.CompletedProcess(args=[], returncode=0, stdout="refs/heads/master\nrefs/remotes/origin/master\n", stderr=""),  # git for-each-ref branch refs
         subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git checkout
         subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git pull
     ]
\ No newline at end of file
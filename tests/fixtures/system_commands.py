@@ -57,25 +57,6 @@ def mock_ar_commands():
         yield mock_run
 
 
-@pytest.fixture
-def mock_sha256sum_commands():
-    """Mock sha256sum commands."""
-    with patch("src.artifacts.run_command") as mock_run:
-        def side_effect(cmd, check=True, binary=False):
-            if "sha256sum" in cmd:
-                # Extract filename from command and return it in the output
-                filename = cmd[-1] if cmd else "filename"
-                return MockCompletedProcess(
-                    returncode=0,
-                    stdout=f"abc123def456  {filename}\n",
-                    stderr=""
-                )
-            return MockCompletedProcess(returncode=0, stdout="", stderr="")
-        
-        mock_run.side_effect = side_effect
-        yield mock_run
-
-
 @pytest.fixture
 def mock_file_commands():
     """Mock file command."""
@@ -1,5 +1,6 @@
 """Tests for repository cloning in repository.py."""
 
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
@@ -25,7 +26,7 @@ class TestCloneRepository:
         # Verify the clone call (second call)
         clone_call = mock_run.call_args_list[1][0][0]
         assert clone_call == [
-            "git", "clone", "--branch", branch,
+            "git", "clone", "--branch", branch, "--filter=blob:none",
             "https://github.com/logos-storage/logos-storage-nim.git",
             str(target_dir)
         ]
@@ -69,8 +70,8 @@ class TestCloneRepository:
             mock_run.return_value.returncode = 1
             clone_repository(target_dir, "master", commit)
 
-        # Now 4 calls: is_tag check + clone + fetch + checkout
-        assert mock_run.call_count == 4
+        # 5 calls: is_tag check + clone + rev-parse --verify + fetch + checkout
+        assert mock_run.call_count == 5
 
         # First call: is_tag() check
         first_call = mock_run.call_args_list[0][0][0]
@@ -84,20 +85,20 @@ class TestCloneRepository:
         assert second_call[1] == "clone"
         assert "--no-checkout" in second_call
 
-        # Third call: git fetch --all --tags
+        # Third call: git rev-parse --verify <commit>^{commit}
         third_call = mock_run.call_args_list[2][0][0]
-        assert third_call[0] == "git"
-        assert third_call[1] == "-C"
-        assert third_call[3] == "fetch"
-        assert "--all" in third_call
-        assert "--tags" in third_call
+        assert third_call == ["git", "-C", str(target_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"]
 
-        # Fourth call: git checkout <commit>
+        # Fourth call: git fetch origin <commit> (commit not in the clone)
         fourth_call = mock_run.call_args_list[3][0][0]
-        assert fourth_call[0] == "git"
-        assert fourth_call[1] == "-C"
-        assert fourth_call[3] == "checkout"
-        assert fourth_call[4] == commit
+        assert fourth_call == ["git", "-C", str(target_dir), "fetch", "origin", commit]
+
+        # Fifth call: git checkout <commit>
+        fifth_call = mock_run.call_args_list[4][0][0]
+        assert fifth_call[0] == "git"
+        assert fifth_call[1] == "-C"
+        assert fifth_call[3] == "checkout"
+        assert fifth_call[4] == commit
 
     def test_clone_repository_at_commit_uses_no_checkout_flag(self):
         """Test that clone_repository uses --no-checkout flag when cloning at commit."""
@@ -114,21 +115,75 @@ class TestCloneRepository:
         assert "--no-checkout" in clone_call
         assert "--branch" not in clone_call
 
-    def test_clone_repository_at_commit_fetches_all_objects(self):
-        """Test that clone_repository fetches all objects when cloning at commit."""
+    def test_clone_repository_at_tag_uses_shallow_clone(self):
+        """Test that clone_repository fetches only the tagged commit when cloning a tag."""
+        target_dir = Path("/tmp/test-repo")
+
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.side_effect = [
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123\trefs/tags/v0.2.5\n", stderr=""),  # is_tag() - is a tag
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # remote set-branches
+            ]
+            clone_repository(target_dir, "v0.2.5")
+
+        assert mock_run.call_count == 3
+        clone_call = mock_run.call_args_list[1][0][0]
+        assert clone_call[:2] == ["git", "clone"]
+        assert "--depth=1" in clone_call
+        assert "--single-branch" in clone_call
+        assert "--no-tags" in clone_call
+        assert clone_call[clone_call.index("--branch") + 1] == "v0.2.5"
+        assert clone_call[-1] == str(target_dir)
+        # The fetch refspec is widened so later branch updates keep working
+        assert mock_run.call_args_list[2][0][0] == [
+            "git", "-C", str(target_dir), "remote", "set-branches", "origin", "*"
+        ]
+
+    def test_clone_repository_uses_partial_clone(self):
+        """Test that clone_repository skips downloading blobs for unused revisions."""
+        target_dir = Path("/tmp/test-repo")
+        commit = "abc123def456789abc123def456789abc123def"
+
+        for args in [("master",), ("master", commit)]:
+            with patch("src.repository.run_command") as mock_run:
+                # Mock is_tag() to return False (not a tag)
+                mock_run.return_value.returncode = 1
+                clone_repository(target_dir, *args)
+
+            clone_call = next(c[0][0] for c in mock_run.call_args_list if c[0][0][1] == "clone")
+            assert "--filter=blob:none" in clone_call
+
+    def test_clone_repository_at_commit_skips_fetch_when_commit_present(self):
+        """Test that clone_repository does not fetch when the clone already has the commit."""
         target_dir = Path("/tmp/test-repo")
         commit = "abc123def456789abc123def456789abc123def"
 
         with patch("src.repository.run_command") as mock_run:
-            # Mock is_tag() to return False (not a tag)
+            mock_run.side_effect = [
+                subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # rev-parse --verify - present
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
+            ]
+            clone_repository(target_dir, "master", commit)
+
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        assert not any("fetch" in cmd for cmd in commands)
+        assert commands[-1] == ["git", "-C", str(target_dir), "checkout", commit]
+
+    def test_clone_repository_at_commit_fetches_missing_commit(self):
+        """Test that clone_repository fetches only the requested commit when it is missing."""
+        target_dir = Path("/tmp/test-repo")
+        commit = "abc123def456789abc123def456789abc123def"
+
+        with patch("src.repository.run_command") as mock_run:
+            # Mock is_tag() and rev-parse --verify to return non-zero (not a tag, commit missing)
             mock_run.return_value.returncode = 1
             clone_repository(target_dir, "master", commit)
 
-        # Third call is the fetch command (first is is_tag, second is clone)
-        fetch_call = mock_run.call_args_list[2][0][0]
-        assert "fetch" in fetch_call
-        assert "--all" in fetch_call
-        assert "--tags" in fetch_call
+        fetch_calls = [c[0][0] for c in mock_run.call_args_list if "fetch" in c[0][0]]
+        assert fetch_calls == [["git", "-C", str(target_dir), "fetch", "origin", commit]]
 
     def test_clone_repository_at_commit_checkouts_commit(self):
         """Test that clone_repository checkouts the specific commit."""
@@ -140,7 +195,7 @@ class TestCloneRepository:
             mock_run.return_value.returncode = 1
             clone_repository(target_dir, "master", commit)
 
-        # Fourth call is the checkout command (first is is_tag, second is clone, third is fetch)
-        checkout_call = mock_run.call_args_list[3][0][0]
+        # Last call is the checkout command
+        checkout_call = mock_run.call_args_list[-1][0][0]
         assert checkout_call[3] == "checkout"
-        assert checkout_call[4] == commit
\ No newline at end of file
+        assert checkout_call[4] == commit
@@ -19,9 +19,8 @@ class TestEnsureLogosStorageRepo:
         with patch("pathlib.Path.exists", return_value=False):
             with patch("src.repository.run_command") as mock_run:
                 # Add is_tag() response at the beginning (returncode=1 means not a tag)
-                # Then add is_tag() response again at the end (for branch name override check)
                 is_tag_response = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="")
-                mock_run.side_effect = [is_tag_response] + mock_git_clone_responses + [is_tag_response]
+                mock_run.side_effect = [is_tag_response] + mock_git_clone_responses
 
                 repo_dir, commit_info = ensure_logos_storage_repo(branch)
 
@@ -36,14 +35,15 @@ class TestEnsureLogosStorageRepo:
         with patch("pathlib.Path.exists", return_value=True):
             with patch("src.repository.run_command") as mock_run:
                 # Add is_tag() response at the beginning (returncode=1 means not a tag)
-                # Then add is_tag() response again at the end (for branch name override check)
+                # and end with the git log -1 response of the clone fixture
                 is_tag_response = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="")
-                mock_run.side_effect = [is_tag_response] + mock_git_update_responses + mock_git_clone_responses + [is_tag_response]
+                mock_run.side_effect = [is_tag_response] + mock_git_update_responses + mock_git_clone_responses[-1:]
 
                 repo_dir, commit_info = ensure_logos_storage_repo(branch)
 
             assert repo_dir == Path("logos-storage-nim")
             assert isinstance(commit_info, CommitInfo)
+            assert commit_info.branch == "master"
 
     def test_ensure_logos_storage_repo_returns_tuple(self, mock_git_clone_responses):
         """Test that ensure_logos_storage_repo returns a tuple of (Path, CommitInfo)."""
@@ -53,10 +53,7 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git clone --branch develop
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="def456789abc123def456789abc123def456789abc\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="def4567\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="develop\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="def456789abc123def456789abc123def456789abc\ndef4567\n1700000000\nHEAD -> develop\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -69,6 +66,8 @@ class TestEnsureLogosStorageRepo:
             assert len(result) == 2
             assert isinstance(result[0], Path)
             assert isinstance(result[1], CommitInfo)
+            assert result[1].branch == "develop"
+            assert result[1].commit_time == 1700000000
 
     def test_ensure_logos_storage_repo_with_custom_branch(self, mock_git_clone_responses):
         """Test that ensure_logos_storage_repo works with custom branch name."""
@@ -78,10 +77,7 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # git clone --branch feature/test-branch
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="feature/test-branch\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> feature/test-branch\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -100,12 +96,9 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # rev-parse --verify - commit already cloned
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -127,11 +120,9 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in update_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=True):
@@ -154,13 +145,9 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="  master\n", stderr=""),  # branch --contains
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # merge-base --is-ancestor
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> master\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -183,9 +170,7 @@ class TestEnsureLogosStorageRepo:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -203,16 +188,13 @@ class TestEnsureLogosStorageRepo:
         """Test that ensure_logos_storage_repo returns 'HEAD' as branch when in detached state without branch."""
         commit = "abc123def456789abc123def456789abc123def"
 
-        # Custom responses where rev-parse --abbrev-ref HEAD returns "HEAD"
+        # Custom responses where the HEAD decoration has no branch
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # rev-parse --verify - commit already cloned
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -228,17 +210,14 @@ class TestEnsureLogosStorageRepo:
         branch = "master"
         commit = "abc123def456789abc123def456789abc123def"
 
-        # Custom responses where rev-parse --abbrev-ref HEAD returns "HEAD" (detached state)
+        # Custom responses where the HEAD decoration has no branch (detached state)
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() in clone_repository - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # rev-parse --verify - commit already cloned
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="  master\n", stderr=""),  # branch --contains
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() at end - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # merge-base --is-ancestor
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -257,13 +236,9 @@ class TestEnsureLogosStorageRepo:
         # Custom responses for tag-based clone
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\trefs/tags/v0.2.5\n", stderr=""),  # is_tag() in clone_repository - is a tag
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # clone --no-checkout
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout tag
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\trefs/tags/v0.2.5\n", stderr=""),  # is_tag() at end - is a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # shallow clone at tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # remote set-branches
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=False):
@@ -286,10 +261,7 @@ class TestEnsureLogosStorageRepo:
             subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\trefs/tags/v0.2.5\n", stderr=""),  # is_tag() in update_repository - is a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout tag
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),  # rev-parse HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),  # rev-parse --short HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),  # rev-parse --abbrev-ref HEAD
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\trefs/tags/v0.2.5\n", stderr=""),  # is_tag() at end - is a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD\n", stderr=""),  # git log -1 (hash, short hash, commit time, HEAD decoration)
         ]
 
         with patch("pathlib.Path.exists", return_value=True):
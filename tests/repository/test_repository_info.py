@@ -49,9 +49,7 @@ class TestGetCommitInfo:
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> master\n", stderr=""),
             ]
             
             result = get_commit_info(repo_dir)
@@ -60,51 +58,37 @@ class TestGetCommitInfo:
         assert result.commit == "abc123def456789abc123def456789abc123def"
         assert result.commit_short == "abc123d"
         assert result.branch == "master"
+        assert result.commit_time == 1700000000
 
-    def test_get_commit_info_calls_rev_parse_head(self):
-        """Test that get_commit_info calls git rev-parse HEAD."""
+    def test_get_commit_info_uses_single_git_call(self):
+        """Test that get_commit_info reads hash, short hash, commit time and branch with one git log."""
         repo_dir = Path("/tmp/test-repo")
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> master\n", stderr=""),
             ]
             
             get_commit_info(repo_dir)
         
-        assert mock_run.call_args_list[0][0][0] == ["git", "-C", str(repo_dir), "rev-parse", "HEAD"]
+        mock_run.assert_called_once_with([
+            "git", "-C", str(repo_dir), "log", "-1",
+            "--decorate=short", "--decorate-refs=HEAD", "--decorate-refs=refs/heads/",
+            "--format=%H%n%h%n%ct%n%D"
+        ])
 
-    def test_get_commit_info_calls_rev_parse_short_head(self):
-        """Test that get_commit_info calls git rev-parse --short HEAD."""
+    def test_get_commit_info_with_branch_containing_slash(self):
+        """Test that get_commit_info keeps the full name of nested branches."""
         repo_dir = Path("/tmp/test-repo")
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD -> release/0.2.5, master\n", stderr=""),
             ]
             
-            get_commit_info(repo_dir)
-        
-        assert mock_run.call_args_list[1][0][0] == ["git", "-C", str(repo_dir), "rev-parse", "--short", "HEAD"]
-
-    def test_get_commit_info_calls_rev_parse_abbrev_ref_head(self):
-        """Test that get_commit_info calls git rev-parse --abbrev-ref HEAD."""
-        repo_dir = Path("/tmp/test-repo")
-        
-        with patch("src.repository.run_command") as mock_run:
-            mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="master\n", stderr=""),
-            ]
-            
-            get_commit_info(repo_dir)
+            result = get_commit_info(repo_dir)
         
-        assert mock_run.call_args_list[2][0][0] == ["git", "-C", str(repo_dir), "rev-parse", "--abbrev-ref", "HEAD"]
+        assert result.branch == "release/0.2.5"
 
     def test_get_commit_info_with_detached_head(self):
         """Test that get_commit_info returns 'HEAD' as branch when in detached HEAD state."""
@@ -112,9 +96,7 @@ class TestGetCommitInfo:
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123d\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="abc123def456789abc123def456789abc123def\nabc123d\n1700000000\nHEAD, master\n", stderr=""),
             ]
             
             result = get_commit_info(repo_dir)
@@ -129,9 +111,7 @@ class TestGetCommitInfo:
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.side_effect = [
-                subprocess.CompletedProcess(args=[], returncode=0, stdout=f"{commit}\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout=f"{commit_short}\n", stderr=""),
-                subprocess.CompletedProcess(args=[], returncode=0, stdout="HEAD\n", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout=f"{commit}\n{commit_short}\n1700000000\nHEAD\n", stderr=""),
             ]
             
             result = get_commit_info(repo_dir)
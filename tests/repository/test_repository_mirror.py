@@ -0,0 +1,85 @@
+"""Tests for the local clone mirror in repository.py."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.repository import clone_repository, get_mirror_dir, update_mirror
+
+
+class TestGetMirrorDir:
+    """Test get_mirror_dir function."""
+
+    def test_get_mirror_dir_returns_none_when_unset(self, mock_os_environ):
+        """Test that mirroring is disabled when GIT_MIRROR is not set."""
+        assert get_mirror_dir() is None
+
+    def test_get_mirror_dir_returns_configured_path(self, mock_os_environ):
+        """Test that get_mirror_dir returns the GIT_MIRROR path."""
+        os.environ["GIT_MIRROR"] = "/cache/logos-storage-nim.git"
+
+        assert get_mirror_dir() == Path("/cache/logos-storage-nim.git")
+
+
+class TestUpdateMirror:
+    """Test update_mirror function."""
+
+    def test_update_mirror_creates_mirror_when_missing(self, temp_dir):
+        """Test that update_mirror clones a bare mirror when none exists."""
+        mirror_dir = temp_dir / "logos-storage-nim.git"
+
+        with patch("src.repository.run_command") as mock_run:
+            update_mirror(mirror_dir)
+
+        mock_run.assert_called_once_with([
+            "git", "clone", "--mirror",
+            "https://github.com/logos-storage/logos-storage-nim.git",
+            str(mirror_dir)
+        ], capture=False)
+
+    def test_update_mirror_refreshes_existing_mirror(self, temp_dir):
+        """Test that update_mirror fetches into an existing mirror."""
+        mirror_dir = temp_dir / "logos-storage-nim.git"
+        mirror_dir.mkdir()
+        (mirror_dir / "HEAD").write_text("ref: refs/heads/master\n")
+
+        with patch("src.repository.run_command") as mock_run:
+            update_mirror(mirror_dir)
+
+        mock_run.assert_called_once_with(
+            ["git", "-C", str(mirror_dir), "remote", "update", "--prune"],
+            capture=False
+        )
+
+
+class TestCloneWithReference:
+    """Test clone_repository with a reference mirror."""
+
+    def test_clone_repository_uses_reference_mirror(self):
+        """Test that clone_repository borrows objects from the mirror."""
+        target_dir = Path("/tmp/test-repo")
+        mirror_dir = Path("/cache/logos-storage-nim.git")
+
+        with patch("src.repository.run_command") as mock_run:
+            # Mock is_tag() to return False (not a tag)
+            mock_run.return_value.returncode = 1
+            clone_repository(target_dir, "master", reference=mirror_dir)
+
+        clone_call = mock_run.call_args_list[1][0][0]
+        assert "--reference-if-able" in clone_call
+        assert clone_call[clone_call.index("--reference-if-able") + 1] == str(mirror_dir)
+        assert "--dissociate" in clone_call
+
+    def test_clone_repository_without_reference(self):
+        """Test that clone_repository does not reference a mirror by default."""
+        target_dir = Path("/tmp/test-repo")
+
+        with patch("src.repository.run_command") as mock_run:
+            # Mock is_tag() to return False (not a tag)
+            mock_run.return_value.returncode = 1
+            clone_repository(target_dir, "master")
+
+        clone_call = mock_run.call_args_list[1][0][0]
+        assert "--reference-if-able" not in clone_call
@@ -27,8 +27,8 @@ class TestUpdateRepository:
         # First call is is_tag() check, second is fetch
         assert mock_run.call_args_list[1][0][0] == ["git", "-C", str(repo_dir), "fetch", "origin"]
 
-    def test_update_repository_checks_local_branch(self, mock_git_update_responses):
-        """Test that update_repository checks if local branch exists."""
+    def test_update_repository_checks_branch_refs_in_one_call(self, mock_git_update_responses):
+        """Test that update_repository lists local and remote branch refs with one git call."""
         repo_dir = Path("/tmp/test-repo")
         branch = "master"
 
@@ -39,22 +39,23 @@ class TestUpdateRepository:
 
             update_repository(repo_dir, branch)
 
-        # Third call is local branch check (first is is_tag, second is fetch)
-        assert mock_run.call_args_list[2][0][0] == [
-            "git", "-C", str(repo_dir), "show-ref", "--verify", "--quiet", f"refs/heads/{branch}"
+        # Fourth call is the branch ref lookup (after is_tag, fetch and the shallow check)
+        assert mock_run.call_args_list[3][0][0] == [
+            "git", "-C", str(repo_dir), "for-each-ref", "--format=%(refname)",
+            f"refs/heads/{branch}", f"refs/remotes/origin/{branch}"
         ]
 
-    def test_update_repository_checks_remote_branch(self):
-        """Test that update_repository checks if remote branch exists when local doesn't."""
+    def test_update_repository_accepts_remote_only_branch(self):
+        """Test that update_repository proceeds when only the remote branch exists."""
         repo_dir = Path("/tmp/test-repo")
-        branch = "master"
+        branch = "develop"
 
         # Custom responses where local branch doesn't exist
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # local branch not found
-            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # remote branch exists
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="refs/remotes/origin/develop\n", stderr=""),  # only remote branch exists
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # pull
         ]
@@ -64,11 +65,29 @@ class TestUpdateRepository:
 
             update_repository(repo_dir, branch)
 
-        # Fourth call is remote branch check
-        assert mock_run.call_args_list[3][0][0] == [
-            "git", "-C", str(repo_dir), "show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch}"
+        assert mock_run.call_args_list[4][0][0] == ["git", "-C", str(repo_dir), "checkout", branch]
+
+    def test_update_repository_ignores_nested_branch_refs(self):
+        """Test that a branch nested below the requested name does not count as a match."""
+        repo_dir = Path("/tmp/test-repo")
+        branch = "feature"
+
+        # for-each-ref matches prefixes up to a slash, so refs below the name can be listed
+        custom_responses = [
+            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="refs/remotes/origin/feature/x\n", stderr=""),  # nested ref only
         ]
 
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.side_effect = custom_responses
+
+            with pytest.raises(ValueError) as exc_info:
+                update_repository(repo_dir, branch)
+
+        assert "Branch 'feature' not found" in str(exc_info.value)
+
     def test_update_repository_raises_error_when_branch_not_found(self):
         """Test that update_repository raises ValueError when branch is not found locally or remotely."""
         repo_dir = Path("/tmp/test-repo")
@@ -78,8 +97,8 @@ class TestUpdateRepository:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # local not found
-            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # remote not found
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # no matching refs
         ]
 
         with patch("src.repository.run_command") as mock_run:
@@ -93,7 +112,7 @@ class TestUpdateRepository:
     def test_update_repository_checkouts_branch(self, mock_git_update_responses):
         """Test that update_repository checks out the specified branch."""
         repo_dir = Path("/tmp/test-repo")
-        branch = "develop"
+        branch = "master"
 
         with patch("src.repository.run_command") as mock_run:
             # Add is_tag() response at the beginning (returncode=1 means not a tag)
@@ -102,7 +121,7 @@ class TestUpdateRepository:
 
             update_repository(repo_dir, branch)
 
-        # Fourth call is checkout (first is is_tag, second is fetch, third is local branch check)
+        # Fifth call is checkout (after is_tag, fetch, shallow check and branch ref lookup)
         assert mock_run.call_args_list[4][0][0] == ["git", "-C", str(repo_dir), "checkout", branch]
 
     def test_update_repository_pulls_from_origin(self, mock_git_update_responses):
@@ -117,7 +136,7 @@ class TestUpdateRepository:
 
             update_repository(repo_dir, branch)
 
-        # Fifth call is pull (first is is_tag, second is fetch, third is local branch check, fourth is checkout)
+        # Sixth call is pull (after is_tag, fetch, shallow check, branch ref lookup and checkout)
         assert mock_run.call_args_list[5][0][0] == ["git", "-C", str(repo_dir), "pull", "origin", branch]
 
     def test_update_repository_at_specific_commit(self):
@@ -129,6 +148,7 @@ class TestUpdateRepository:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
         ]
 
@@ -137,8 +157,8 @@ class TestUpdateRepository:
                 mock_run.side_effect = custom_responses
                 update_repository(repo_dir, "master", commit)
 
-        # Now 3 calls: is_tag check + fetch + checkout
-        assert mock_run.call_count == 3
+        # Now 4 calls: is_tag check + fetch + shallow check + checkout
+        assert mock_run.call_count == 4
 
         # Second call: git fetch --all --tags (first is is_tag)
         second_call = mock_run.call_args_list[1][0][0]
@@ -148,12 +168,12 @@ class TestUpdateRepository:
         assert "--all" in second_call
         assert "--tags" in second_call
 
-        # Third call: git checkout <commit>
-        third_call = mock_run.call_args_list[2][0][0]
-        assert third_call[0] == "git"
-        assert third_call[1] == "-C"
-        assert third_call[3] == "checkout"
-        assert third_call[4] == commit
+        # Fourth call: git checkout <commit>
+        checkout_call = mock_run.call_args_list[3][0][0]
+        assert checkout_call[0] == "git"
+        assert checkout_call[1] == "-C"
+        assert checkout_call[3] == "checkout"
+        assert checkout_call[4] == commit
 
     def test_update_repository_at_commit_validates_commit_exists(self):
         """Test that update_repository validates commit exists before checkout."""
@@ -164,6 +184,7 @@ class TestUpdateRepository:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
         ]
 
@@ -184,6 +205,7 @@ class TestUpdateRepository:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
         ]
 
         with patch("src.repository.validate_commit_exists", return_value=False):
@@ -203,6 +225,7 @@ class TestUpdateRepository:
         custom_responses = [
             subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="false\n", stderr=""),  # rev-parse --is-shallow-repository
             subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
         ]
 
@@ -215,4 +238,64 @@ class TestUpdateRepository:
         fetch_call = mock_run.call_args_list[1][0][0]
         assert "fetch" in fetch_call
         assert "--all" in fetch_call
-        assert "--tags" in fetch_call
\ No newline at end of file
+        assert "--tags" in fetch_call
+
+    def test_update_repository_at_commit_unshallows_tag_checkout(self):
+        """Test that a checkout reused from a shallow tag clone gets its full history before validation."""
+        repo_dir = Path("/tmp/test-repo")
+        commit = "abc123def456789abc123def456789abc123def"
+
+        custom_responses = [
+            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --all --tags
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="true\n", stderr=""),  # rev-parse --is-shallow-repository
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --unshallow
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout commit
+        ]
+
+        with patch("src.repository.validate_commit_exists", return_value=True) as mock_validate:
+            with patch("src.repository.run_command") as mock_run:
+                mock_run.side_effect = custom_responses
+                mock_validate.side_effect = lambda *args: (
+                    mock_run.call_args_list[-1][0][0][3:5] == ["fetch", "--unshallow"]
+                )
+                update_repository(repo_dir, "master", commit)
+
+        assert mock_run.call_args_list[3][0][0] == [
+            "git", "-C", str(repo_dir), "fetch", "--unshallow", "origin"
+        ]
+        assert mock_run.call_args_list[4][0][0] == ["git", "-C", str(repo_dir), "checkout", commit]
+
+    def test_update_repository_at_branch_unshallows_tag_checkout(self):
+        """Test that a branch update after a shallow tag clone fetches the full history."""
+        repo_dir = Path("/tmp/test-repo")
+
+        custom_responses = [
+            subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr=""),  # is_tag() - not a tag
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="true\n", stderr=""),  # rev-parse --is-shallow-repository
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # fetch --unshallow
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="refs/remotes/origin/master\n", stderr=""),  # branch refs
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # checkout
+            subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),  # pull
+        ]
+
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.side_effect = custom_responses
+            update_repository(repo_dir, "master")
+
+        assert mock_run.call_args_list[3][0][0] == [
+            "git", "-C", str(repo_dir), "fetch", "--unshallow", "origin"
+        ]
+
+    def test_update_repository_skips_unshallow_for_full_clone(self, mock_git_update_responses):
+        """Test that a complete checkout is not fetched again."""
+        repo_dir = Path("/tmp/test-repo")
+
+        with patch("src.repository.run_command") as mock_run:
+            is_tag_response = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="")
+            mock_run.side_effect = [is_tag_response] + mock_git_update_responses
+
+            update_repository(repo_dir, "master")
+
+        assert not any("--unshallow" in call[0][0] for call in mock_run.call_args_list)
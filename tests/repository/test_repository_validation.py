@@ -1,11 +1,12 @@
 """Tests for repository validation in repository.py."""
 
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from src.repository import validate_commit_exists, validate_commit_in_branch
+from src.repository import REPO_URL, is_tag, validate_commit_exists, validate_commit_in_branch
 
 
 class TestValidateCommitExists:
@@ -23,7 +24,7 @@ class TestValidateCommitExists:
         
         assert result is True
         mock_run.assert_called_once_with(
-            ["git", "-C", str(repo_dir), "cat-file", "-e", commit],
+            ["git", "-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"],
             check=False
         )
 
@@ -39,7 +40,7 @@ class TestValidateCommitExists:
         
         assert result is False
         mock_run.assert_called_once_with(
-            ["git", "-C", str(repo_dir), "cat-file", "-e", commit],
+            ["git", "-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"],
             check=False
         )
 
@@ -55,7 +56,7 @@ class TestValidateCommitExists:
         
         assert result is True
         mock_run.assert_called_once_with(
-            ["git", "-C", str(repo_dir), "cat-file", "-e", commit],
+            ["git", "-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"],
             check=False
         )
 
@@ -71,13 +72,12 @@ class TestValidateCommitInBranch:
         
         with patch("src.repository.run_command") as mock_run:
             mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = f"  master\n  develop\n"
             
             result = validate_commit_in_branch(repo_dir, commit, branch)
         
         assert result is True
         mock_run.assert_called_once_with(
-            ["git", "-C", str(repo_dir), "branch", "--contains", commit],
+            ["git", "-C", str(repo_dir), "merge-base", "--is-ancestor", commit, "refs/remotes/origin/master"],
             check=False
         )
 
@@ -88,12 +88,41 @@ class TestValidateCommitInBranch:
         branch = "develop"
         
         with patch("src.repository.run_command") as mock_run:
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = "  master\n"
+            mock_run.return_value.returncode = 1
             
             result = validate_commit_in_branch(repo_dir, commit, branch)
         
         assert result is False
+        mock_run.assert_called_once()
+
+    def test_validate_commit_in_branch_does_not_match_branch_prefix(self):
+        """Test that validate_commit_in_branch checks the exact branch, not a name substring."""
+        repo_dir = Path("/tmp/test-repo")
+        commit = "abc123def456789abc123def456789abc123def"
+        
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.return_value.returncode = 1
+            
+            result = validate_commit_in_branch(repo_dir, commit, "main")
+        
+        assert result is False
+        assert mock_run.call_args[0][0][-1] == "refs/remotes/origin/main"
+
+    def test_validate_commit_in_branch_falls_back_to_local_branch(self):
+        """Test that validate_commit_in_branch checks the local branch when there is no remote one."""
+        repo_dir = Path("/tmp/test-repo")
+        commit = "abc123def456789abc123def456789abc123def"
+        
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.side_effect = [
+                subprocess.CompletedProcess(args=[], returncode=128, stdout="", stderr=""),
+                subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
+            ]
+            
+            result = validate_commit_in_branch(repo_dir, commit, "local-only")
+        
+        assert result is True
+        assert mock_run.call_args_list[1][0][0][-1] == "refs/heads/local-only"
 
     def test_validate_commit_in_branch_returns_false_on_command_failure(self):
         """Test that validate_commit_in_branch returns False when git command fails."""
@@ -102,7 +131,7 @@ class TestValidateCommitInBranch:
         branch = "master"
         
         with patch("src.repository.run_command") as mock_run:
-            mock_run.return_value.returncode = 1
+            mock_run.return_value.returncode = 128
             
             result = validate_commit_in_branch(repo_dir, commit, branch)
         
@@ -120,6 +149,38 @@ class TestValidateCommitInBranch:
         
         assert result is True
         mock_run.assert_called_once_with(
-            ["git", "-C", str(repo_dir), "cat-file", "-e", commit],
+            ["git", "-C", str(repo_dir), "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}"],
             check=False
-        )
\ No newline at end of file
+        )
+
+
+class TestIsTag:
+    """Test is_tag function."""
+
+    def test_is_tag_lists_remote_tags_once(self):
+        """Test that is_tag answers every ref from a single ls-remote call."""
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = (
+                "abc123\trefs/tags/v0.2.5\n"
+                "def456\trefs/tags/v0.2.5^{}\n"
+                "fed789\trefs/tags/v0.2.6\n"
+            )
+
+            assert is_tag("v0.2.5") is True
+            assert is_tag("v0.2.6") is True
+            assert is_tag("master") is False
+            assert is_tag("v0.2.5^{}") is False
+
+        mock_run.assert_called_once_with(
+            ["git", "ls-remote", "--tags", REPO_URL],
+            check=False
+        )
+
+    def test_is_tag_returns_false_when_remote_unreachable(self):
+        """Test that is_tag treats a failed ls-remote as no tags."""
+        with patch("src.repository.run_command") as mock_run:
+            mock_run.return_value.returncode = 128
+            mock_run.return_value.stdout = ""
+
+            assert is_tag("v0.2.5") is False
@@ -1,5 +1,6 @@
 """Unit tests for release_notes module."""
 
+import io
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -156,19 +157,35 @@ class TestFormatCommitEntry:
         assert result == expected
 
 
+def _mock_git_log(mock_popen, stdout, returncode=0, stderr=""):
+    """Configure a mocked subprocess.Popen to stream the given git log output."""
+    proc = mock_popen.return_value.__enter__.return_value
+    proc.stdout = io.BytesIO(stdout.encode())
+    proc.returncode = returncode
+    proc.args = ["git", "log"]
+
+    def popen(*args, **kwargs):
+        # git writes its errors to the file handed over as stderr
+        kwargs["stderr"].write(stderr.encode())
+        return mock_popen.return_value
+
+    mock_popen.side_effect = popen
+    return proc
+
+
 class TestGetCommitsBetween:
     """Test getting commits between two commits."""
 
-    @patch("src.release_notes.subprocess.run")
-    def test_get_commits_between_returns_commits(self, mock_run):
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_returns_commits(self, mock_popen):
         """Test getting commits between two commits."""
-        mock_run.return_value = MagicMock(
-            stdout="abc123def456789|feat: add feature|John Doe\n"
-                   "def456789abc123|fix: bug fix|Jane Smith\n",
-            returncode=0
+        _mock_git_log(
+            mock_popen,
+            "abc123def456789\0feat: add feature\0John Doe\0"
+            "def456789abc123\0fix: bug fix\0Jane Smith"
         )
 
-        result = get_commits_between(Path("/tmp/repo"), "prev", "curr")
+        result = list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
 
         assert len(result) == 2
         assert result[0]["hash"] == "abc123d"
@@ -178,65 +195,95 @@ class TestGetCommitsBetween:
         assert result[1]["message"] == "fix: bug fix"
         assert result[1]["author"] == "Jane Smith"
 
-    @patch("src.release_notes.subprocess.run")
-    def test_get_commits_between_empty_range(self, mock_run):
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_empty_range(self, mock_popen):
         """Test getting commits when range is empty."""
-        mock_run.return_value = MagicMock(
-            stdout="",
-            returncode=0
-        )
+        _mock_git_log(mock_popen, "")
 
-        result = get_commits_between(Path("/tmp/repo"), "prev", "curr")
+        result = list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
 
         assert len(result) == 0
 
-    @patch("src.release_notes.subprocess.run")
-    def test_get_commits_between_single_commit(self, mock_run):
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_single_commit(self, mock_popen):
         """Test getting single commit."""
-        mock_run.return_value = MagicMock(
-            stdout="abc123def456789|feat: add feature|John Doe\n",
-            returncode=0
-        )
+        _mock_git_log(mock_popen, "abc123def456789\0feat: add feature\0John Doe")
 
-        result = get_commits_between(Path("/tmp/repo"), "prev", "curr")
+        result = list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
 
         assert len(result) == 1
         assert result[0]["hash"] == "abc123d"
         assert result[0]["message"] == "feat: add feature"
         assert result[0]["author"] == "John Doe"
 
-    @patch("src.release_notes.subprocess.run")
-    def test_get_commits_between_calls_git_correctly(self, mock_run):
-        """Test that get_commits_between calls git with correct arguments."""
-        mock_run.return_value = MagicMock(
-            stdout="",
-            returncode=0
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_yields_lazily(self, mock_popen):
+        """Test that commits are yielded before the whole log is consumed."""
+        _mock_git_log(
+            mock_popen,
+            "abc123def456789\0feat: add feature\0John Doe\0"
+            "def456789abc123\0fix: bug fix\0Jane Smith"
+        )
+
+        commits = get_commits_between(Path("/tmp/repo"), "prev", "curr")
+        first = next(commits)
+
+        assert first["hash"] == "abc123d"
+        assert next(commits)["hash"] == "def4567"
+
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_keeps_pipes_in_fields(self, mock_popen):
+        """Test that a | in the subject or author name does not split the field."""
+        _mock_git_log(mock_popen, "abc123def456789\0feat: a | b\0Jane | Doe")
+
+        result = list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
+
+        assert result == [{"hash": "abc123d", "message": "feat: a | b", "author": "Jane | Doe"}]
+
+    @patch("src.release_notes._READ_SIZE", 5)
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_handles_fields_split_across_reads(self, mock_popen):
+        """Test that fields spanning several reads are reassembled."""
+        _mock_git_log(
+            mock_popen,
+            "abc123def456789\0feat: add feature\0John Doe\0"
+            "def456789abc123\0fix: bug fix\0Jane Smith"
         )
 
-        get_commits_between(Path("/tmp/repo"), "prev123", "curr456")
+        result = list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
+
+        assert [c["message"] for c in result] == ["feat: add feature", "fix: bug fix"]
+        assert [c["author"] for c in result] == ["John Doe", "Jane Smith"]
 
-        mock_run.assert_called_once()
-        args = mock_run.call_args[0][0]
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_calls_git_correctly(self, mock_popen):
+        """Test that get_commits_between calls git with correct arguments."""
+        _mock_git_log(mock_popen, "")
+
+        list(get_commits_between(Path("/tmp/repo"), "prev123", "curr456"))
+
+        mock_popen.assert_called_once()
+        args = mock_popen.call_args[0][0]
         assert args[0] == "git"
         assert args[1] == "log"
-        assert args[2] == "--pretty=format:%H|%s|%an"
-        assert args[3] == "prev123..curr456"
-        assert mock_run.call_args[1]["cwd"] == Path("/tmp/repo")
-        assert mock_run.call_args[1]["capture_output"] is True
-        assert mock_run.call_args[1]["text"] is True
-        assert mock_run.call_args[1]["check"] is True
-
-    @patch("src.release_notes.subprocess.run")
-    def test_get_commits_between_propagates_error(self, mock_run):
-        """Test that get_commits_between propagates git errors."""
-        mock_run.side_effect = subprocess.CalledProcessError(
-            1, "git", stderr="fatal: bad revision"
-        )
+        assert args[2] == "-z"
+        assert args[3] == "--pretty=format:%H%x00%s%x00%an"
+        assert args[4] == "prev123..curr456"
+        assert mock_popen.call_args[1]["cwd"] == Path("/tmp/repo")
+        assert mock_popen.call_args[1]["stdout"] == subprocess.PIPE
+        # stderr must not be a pipe that is only drained after stdout
+        assert mock_popen.call_args[1]["stderr"] != subprocess.PIPE
+
+    @patch("src.release_notes.subprocess.Popen")
+    def test_get_commits_between_propagates_error(self, mock_popen):
+        """Test that get_commits_between raises when git fails."""
+        _mock_git_log(mock_popen, "", returncode=128, stderr="fatal: bad revision")
 
         with pytest.raises(subprocess.CalledProcessError) as exc_info:
-            get_commits_between(Path("/tmp/repo"), "prev", "curr")
+            list(get_commits_between(Path("/tmp/repo"), "prev", "curr"))
 
-        assert exc_info.value.returncode == 1
+        assert exc_info.value.returncode == 128
+        assert exc_info.value.stderr == "fatal: bad revision"
 
 
 class TestFormatReleaseNotes:
@@ -112,4 +112,34 @@ class TestRunCommand:
         result = run_command(["echo", "test"], binary=False)
         
         assert isinstance(result.stdout, str)
-        assert result.stdout == "test\n"
\ No newline at end of file
+        assert result.stdout == "test\n"
+
+    def test_run_command_captures_output_by_default(self, mock_subprocess_run):
+        """Test that run_command captures stdout and stderr as text unless told otherwise."""
+        mock_subprocess_run.return_value = subprocess.CompletedProcess(
+            args=["echo", "test"],
+            returncode=0,
+            stdout="test\n",
+            stderr=""
+        )
+        
+        run_command(["echo", "test"])
+        
+        call_kwargs = mock_subprocess_run.call_args[1]
+        assert call_kwargs["capture_output"] is True
+        assert call_kwargs["text"] is True
+
+    def test_run_command_without_capture_inherits_stdio(self, mock_subprocess_run):
+        """Test that capture=False lets the command write to the parent's stdout and stderr."""
+        mock_subprocess_run.return_value = subprocess.CompletedProcess(
+            args=["git", "fetch"],
+            returncode=0
+        )
+        
+        result = run_command(["git", "fetch"], capture=False)
+        
+        call_kwargs = mock_subprocess_run.call_args[1]
+        assert "capture_output" not in call_kwargs
+        assert "text" not in call_kwargs
+        assert "stdout" not in call_kwargs
+        assert result.stdout is None
@@ -2,6 +2,7 @@
 
 import os
 import subprocess
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -24,6 +25,12 @@ class TestConfigureReproducibleEnvironment:
         
         assert os.environ["SOURCE_DATE_EPOCH"] == "1234567890"
 
+    def test_uses_given_commit_time_without_running_git(self, mock_utils_run_command, mock_os_environ):
+        configure_reproducible_environment(Path("logos-storage-nim"), 1700000000)
+        
+        assert os.environ["SOURCE_DATE_EPOCH"] == "1700000000"
+        mock_utils_run_command.assert_not_called()
+
     def test_sets_source_date_epoch_to_zero_when_git_fails(self, mock_utils_run_command, mock_os_environ):
         mock_utils_run_command.return_value = subprocess.CompletedProcess(
             args=["git", "log", "-1", "--format=%ct"],
@@ -79,4 +86,26 @@ class TestConfigureReproducibleEnvironment:
         
         assert os.environ["SOURCE_DATE_EPOCH"] == "1234567890"
         assert os.environ["TZ"] == "UTC"
-        assert os.environ["LC_ALL"] == "C.UTF-8"
\ No newline at end of file
+        assert os.environ["LC_ALL"] == "C.UTF-8"
+
+    def test_reads_commit_time_from_repo_dir(self, mock_utils_run_command, mock_os_environ):
+        mock_utils_run_command.return_value = subprocess.CompletedProcess(
+            args=["git", "-C", "logos-storage-nim", "log", "-1", "--format=%ct"],
+            returncode=0,
+            stdout="1234567890\n",
+            stderr=""
+        )
+        
+        configure_reproducible_environment(Path("logos-storage-nim"))
+        
+        mock_utils_run_command.assert_called_once_with(
+            ["git", "-C", "logos-storage-nim", "log", "-1", "--format=%ct"], check=False
+        )
+        assert os.environ["SOURCE_DATE_EPOCH"] == "1234567890"
+
+    def test_sets_zero_ar_date(self, mock_utils_run_command, mock_os_environ):
+        mock_utils_run_command.side_effect = FileNotFoundError()
+        
+        configure_reproducible_environment()
+        
+        assert os.environ["ZERO_AR_DATE"] == "1"
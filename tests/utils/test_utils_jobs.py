@@ -1,6 +1,6 @@
 """Tests for parallel jobs in utils.py."""
 
-import subprocess
+import os
 from unittest.mock import patch
 
 import pytest
@@ -9,156 +9,97 @@ from src.utils import get_parallel_jobs
 
 
 class TestGetParallelJobs:
-    """Test get_parallel_jobs function on Linux."""
-
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_returns_cpu_count_minus_one(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["nproc"],
-            returncode=0,
-            stdout="8\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+    """Test get_parallel_jobs function with CPU affinity support."""
+
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", True)
+    def test_get_parallel_jobs_returns_cpu_count_minus_one(self, mock_utils_run_command, mock_os_environ):
+        with patch("os.sched_getaffinity", create=True, return_value=set(range(8))):
+            result = get_parallel_jobs()
         
         assert result == 7
-        mock_utils_run_command.assert_called_once_with(["nproc"], check=False)
-
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_with_single_cpu(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["nproc"],
-            returncode=0,
-            stdout="1\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
-        
-        assert result == 1
+        mock_utils_run_command.assert_not_called()
 
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_with_two_cpus(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["nproc"],
-            returncode=0,
-            stdout="2\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", True)
+    def test_get_parallel_jobs_with_single_cpu(self, mock_os_environ):
+        with patch("os.sched_getaffinity", create=True, return_value={0}):
+            result = get_parallel_jobs()
         
         assert result == 1
 
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_when_nproc_fails(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["nproc"],
-            returncode=1,
-            stdout="",
-            stderr="error"
-        )
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", True)
+    def test_get_parallel_jobs_with_two_cpus(self, mock_os_environ):
+        with patch("os.sched_getaffinity", create=True, return_value={0, 1}):
+            result = get_parallel_jobs()
         
         assert result == 1
 
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_when_nproc_not_found(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.side_effect = FileNotFoundError()
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", True)
+    def test_get_parallel_jobs_respects_affinity_mask(self, mock_os_environ):
+        with patch("os.sched_getaffinity", create=True, return_value={2, 3, 4}):
+            with patch("os.cpu_count", return_value=64):
+                result = get_parallel_jobs()
         
-        assert result == 1
+        assert result == 2
 
-    @patch("platform.system", return_value="Linux")
-    def test_get_parallel_jobs_with_invalid_output(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["nproc"],
-            returncode=0,
-            stdout="invalid\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", True)
+    def test_get_parallel_jobs_detects_cpus_once(self, mock_os_environ):
+        with patch("os.sched_getaffinity", create=True, return_value=set(range(8))) as mock_affinity:
+            get_parallel_jobs()
+            get_parallel_jobs()
         
-        assert result == 1
+        mock_affinity.assert_called_once_with(0)
 
 
-class TestGetParallelJobsMacOS:
-    """Test get_parallel_jobs function on macOS."""
+class TestGetParallelJobsWithoutAffinity:
+    """Test get_parallel_jobs function on platforms without sched_getaffinity (macOS, Windows)."""
 
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_returns_cpu_count_minus_one_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["sysctl", "-n", "hw.ncpu"],
-            returncode=0,
-            stdout="8\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", False)
+    def test_get_parallel_jobs_returns_cpu_count_minus_one(self, mock_os_environ):
+        with patch("os.cpu_count", return_value=8):
+            result = get_parallel_jobs()
         
         assert result == 7
-        mock_utils_run_command.assert_called_once_with(["sysctl", "-n", "hw.ncpu"], check=False)
-
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_with_single_cpu_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["sysctl", "-n", "hw.ncpu"],
-            returncode=0,
-            stdout="1\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", False)
+    def test_get_parallel_jobs_with_single_cpu(self, mock_os_environ):
+        with patch("os.cpu_count", return_value=1):
+            result = get_parallel_jobs()
         
         assert result == 1
 
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_with_two_cpus_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["sysctl", "-n", "hw.ncpu"],
-            returncode=0,
-            stdout="2\n",
-            stderr=""
-        )
-        
-        result = get_parallel_jobs()
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", False)
+    def test_get_parallel_jobs_when_cpu_count_unknown(self, mock_os_environ):
+        with patch("os.cpu_count", return_value=None):
+            result = get_parallel_jobs()
         
         assert result == 1
 
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_when_sysctl_fails_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["sysctl", "-n", "hw.ncpu"],
-            returncode=1,
-            stdout="",
-            stderr="error"
-        )
+
+class TestGetParallelJobsOverride:
+    """Test the JOBS environment variable override."""
+
+    def test_get_parallel_jobs_uses_jobs_env(self, mock_os_environ):
+        os.environ["JOBS"] = "3"
         
-        result = get_parallel_jobs()
+        with patch("src.utils._cpu_count", return_value=8):
+            result = get_parallel_jobs()
         
-        assert result == 1
+        assert result == 3
 
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_when_sysctl_not_found_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.side_effect = FileNotFoundError()
+    def test_get_parallel_jobs_caps_jobs_env_at_cpu_count(self, mock_os_environ):
+        os.environ["JOBS"] = "32"
         
-        result = get_parallel_jobs()
+        with patch("src.utils._cpu_count", return_value=8):
+            result = get_parallel_jobs()
         
-        assert result == 1
+        assert result == 8
 
-    @patch("platform.system", return_value="Darwin")
-    def test_get_parallel_jobs_with_invalid_output_macos(self, mock_system, mock_utils_run_command):
-        mock_utils_run_command.return_value = subprocess.CompletedProcess(
-            args=["sysctl", "-n", "hw.ncpu"],
-            returncode=0,
-            stdout="invalid\n",
-            stderr=""
-        )
+    @pytest.mark.parametrize("value", ["0", "-2", "many", "", "\u00b2"])
+    @patch("src.utils._HAS_SCHED_GETAFFINITY", False)
+    def test_get_parallel_jobs_ignores_invalid_jobs_env(self, value, mock_os_environ):
+        os.environ["JOBS"] = value
         
-        result = get_parallel_jobs()
+        with patch("os.cpu_count", return_value=8):
+            result = get_parallel_jobs()
         
-        assert result == 1
\ No newline at end of file
+        assert result == 7
@@ -145,4 +145,24 @@ class TestGetPlatformIdentifierMacOS:
         
         result = get_platform_identifier()
         
-        assert result == "darwin-unknown"
\ No newline at end of file
+        assert result == "darwin-unknown"
+
+class TestGetPlatformIdentifierOther:
+    """Test get_platform_identifier function on other systems."""
+
+    @patch("platform.system", return_value="FreeBSD")
+    def test_get_platform_identifier_other_system(self, mock_system, mock_platform_machine):
+        mock_platform_machine.return_value = "amd64"
+        
+        result = get_platform_identifier()
+        
+        assert result == "freebsd-amd64"
+
+    @patch("platform.system", return_value="Linux")
+    def test_get_platform_identifier_is_computed_once(self, mock_system, mock_platform_machine):
+        mock_platform_machine.return_value = "x86_64"
+        
+        get_platform_identifier()
+        get_platform_identifier()
+        
+        mock_system.assert_called_once()